@@ -23,6 +23,49 @@ resource "aws_apigatewayv2_route" "api_search" {
   target    = "integrations/${aws_apigatewayv2_integration.publications.id}"
 }
 
+resource "aws_apigatewayv2_route" "api_bootstrap" {
+  api_id    = aws_apigatewayv2_api.publications.id
+  route_key = "GET /api/bootstrap"
+  target    = "integrations/${aws_apigatewayv2_integration.publications.id}"
+}
+
+resource "aws_apigatewayv2_route" "api_authors_suggest" {
+  api_id    = aws_apigatewayv2_api.publications.id
+  route_key = "GET /api/authors/suggest"
+  target    = "integrations/${aws_apigatewayv2_integration.publications.id}"
+}
+
+resource "aws_apigatewayv2_route" "api_export" {
+  api_id    = aws_apigatewayv2_api.publications.id
+  route_key = "GET /api/export"
+  target    = "integrations/${aws_apigatewayv2_integration.publications.id}"
+}
+
+resource "aws_apigatewayv2_route" "api_index" {
+  api_id    = aws_apigatewayv2_api.publications.id
+  route_key = "GET /api/index"
+  target    = "integrations/${aws_apigatewayv2_integration.publications.id}"
+}
+
+resource "aws_apigatewayv2_route" "api_batch_get" {
+  api_id    = aws_apigatewayv2_api.publications.id
+  route_key = "GET /api/batch"
+  target    = "integrations/${aws_apigatewayv2_integration.publications.id}"
+}
+
+resource "aws_apigatewayv2_route" "api_batch_post" {
+  api_id    = aws_apigatewayv2_api.publications.id
+  route_key = "POST /api/batch"
+  target    = "integrations/${aws_apigatewayv2_integration.publications.id}"
+}
+
+# JSON POSTs are not simple cross-origin requests, so browsers preflight them.
+resource "aws_apigatewayv2_route" "api_batch_options" {
+  api_id    = aws_apigatewayv2_api.publications.id
+  route_key = "OPTIONS /api/batch"
+  target    = "integrations/${aws_apigatewayv2_integration.publications.id}"
+}
+
 resource "aws_apigatewayv2_route" "health" {
   api_id    = aws_apigatewayv2_api.publications.id
   route_key = "GET /health"
@@ -2,6 +2,7 @@ import os
 
 PUBLICATIONS_WORKSHEET = os.getenv("PUBLICATIONS_WORKSHEET", "Publications")
 AUTHORS_WORKSHEET = os.getenv("AUTHORS_WORKSHEET", "Current_IISD-ELA_Authors")
+GOOGLE_SHEETS_API_BASE_URL = "https://sheets.googleapis.com"
 SSM_PARAMETER_PREFIX = os.getenv(
     "GOOGLE_SHEETS_CREDENTIAL_PARAMETER_PREFIX",
     "/iisd-ela/config/publications",
@@ -50,6 +51,37 @@ AUTHOR_TYPE_OPTIONS = [
     "Students (theses)",
 ]
 
+AUTHOR_SUGGEST_LIMIT = 10
+MAX_AUTHOR_SUGGEST_LIMIT = 50
+
+MAX_BATCH_QUERIES = int(os.getenv("PUBLICATIONS_MAX_BATCH_QUERIES", "50"))
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "bibtex": ("application/x-bibtex; charset=utf-8", "bib"),
+    "ris": ("application/x-research-info-systems; charset=utf-8", "ris"),
+}
+
+# Columns published in the client-side search index. Other sheet columns are
+# only searchable through the API.
+CLIENT_INDEX_SEARCH_COLUMNS = (
+    "authors",
+    "year",
+    "title",
+    "type",
+    "data_type_tags",
+    "environmental_issue_tags",
+    "lake_tags",
+    "relationship_to_iisd_ela",
+    "journal_name",
+    "journal_vol_no",
+    "journal_issue_no",
+    "journal_page_range",
+    "thesis_uni",
+    "thesis_db",
+    "doi_or_url",
+)
+
 IGNORED_GENERAL_SEARCH_COLUMNS = {
     "source",
     "approved_date",
@@ -65,3 +97,11 @@ def get_spreadsheet_id():
     if not spreadsheet_id:
         raise RuntimeError("GOOGLE_SPREADSHEET_ID must be set")
     return spreadsheet_id
+
+
+def get_sheets_api_base_url():
+    return os.getenv("GOOGLE_SHEETS_API_BASE_URL", GOOGLE_SHEETS_API_BASE_URL).rstrip("/")
+
+
+def use_sheets_emulator():
+    return os.getenv("GOOGLE_SHEETS_EMULATOR", "").strip().lower() in ("1", "true", "yes")
@@ -2,20 +2,38 @@ import logging
 import os
 import time
 
+import requests
 from google.auth.transport.requests import AuthorizedSession
 from google.oauth2 import service_account
 from requests import RequestException
 
-from .config import AUTHORS_WORKSHEET, PUBLICATIONS_WORKSHEET, get_spreadsheet_id
+from .config import (
+    AUTHORS_WORKSHEET,
+    PUBLICATIONS_WORKSHEET,
+    get_sheets_api_base_url,
+    get_spreadsheet_id,
+    use_sheets_emulator,
+)
 from .credentials import get_google_credentials_info
 
 
 SCOPES = ("https://www.googleapis.com/auth/spreadsheets.readonly",)
 LOGGER = logging.getLogger(__name__)
-_CACHE = {"expires_at": 0, "stale_expires_at": 0, "value": None}
+_CACHE = {
+    "expires_at": 0,
+    "stale_expires_at": 0,
+    "value": None,
+    "frozen": False,
+    "on_refresh": None,
+}
 
 
 def get_sheet_rows(cache_ttl_seconds=300, force_refresh=False):
+    if _CACHE["frozen"] and _CACHE["value"] is not None:
+        if force_refresh and _CACHE["on_refresh"] is not None:
+            _CACHE["on_refresh"]()
+        return _CACHE["value"]
+
     now = time.monotonic()
     if (
         not force_refresh
@@ -24,11 +42,7 @@ def get_sheet_rows(cache_ttl_seconds=300, force_refresh=False):
     ):
         return _CACHE["value"]
 
-    credentials = service_account.Credentials.from_service_account_info(
-        get_google_credentials_info(),
-        scopes=SCOPES,
-    )
-    session = AuthorizedSession(credentials)
+    session = _session()
     try:
         response = _get_values(session)
     except RequestException:
@@ -59,6 +73,23 @@ def get_sheet_rows(cache_ttl_seconds=300, force_refresh=False):
     return payload
 
 
+def freeze_cache(on_refresh=None):
+    # A supervising process owns refreshes; on_refresh asks it for one.
+    _CACHE["frozen"] = True
+    _CACHE["on_refresh"] = on_refresh
+
+
+def _session():
+    # The local emulator does not check Google credentials.
+    if use_sheets_emulator():
+        return requests.Session()
+    credentials = service_account.Credentials.from_service_account_info(
+        get_google_credentials_info(),
+        scopes=SCOPES,
+    )
+    return AuthorizedSession(credentials)
+
+
 def _get_values(session):
     timeout_seconds = float(os.getenv("GOOGLE_SHEETS_TIMEOUT_SECONDS", "30"))
     max_attempts = max(1, int(os.getenv("GOOGLE_SHEETS_MAX_ATTEMPTS", "2")))
@@ -67,7 +98,7 @@ def _get_values(session):
     for attempt in range(max_attempts):
         try:
             response = session.get(
-                f"https://sheets.googleapis.com/v4/spreadsheets/{get_spreadsheet_id()}/values:batchGet",
+                f"{get_sheets_api_base_url()}/v4/spreadsheets/{get_spreadsheet_id()}/values:batchGet",
                 params=[
                     ("ranges", PUBLICATIONS_WORKSHEET),
                     ("ranges", AUTHORS_WORKSHEET),
@@ -1,8 +1,23 @@
+import base64
 import json
 import logging
 from urllib.parse import parse_qs
 
-from .publications import get_options, search_publications
+from .config import (
+    AUTHOR_SUGGEST_LIMIT,
+    EXPORT_FORMATS,
+    MAX_AUTHOR_SUGGEST_LIMIT,
+    MAX_BATCH_QUERIES,
+)
+from .publications import (
+    export_publications,
+    get_bootstrap,
+    get_client_index,
+    get_options,
+    search_publications,
+    search_publications_batch,
+    suggest_authors,
+)
 
 
 LOGGER = logging.getLogger()
@@ -38,7 +53,20 @@ def _dispatch(event):
         params = _query_params(event)
         return _json_response(
             200,
-            get_options(force_refresh=_truthy(_first(params.get("refresh")))),
+            get_options(
+                force_refresh=_truthy(_first(params.get("refresh"))),
+                include_authors=_truthy(_first(params.get("authors"))),
+            ),
+        )
+
+    if path == "/api/bootstrap":
+        params = _query_params(event)
+        return _json_response(
+            200,
+            get_bootstrap(
+                params,
+                force_refresh=_truthy(_first(params.get("refresh"))),
+            ),
         )
 
     if path == "/api/search":
@@ -51,16 +79,74 @@ def _dispatch(event):
             ),
         )
 
+    if path == "/api/authors/suggest":
+        params = _query_params(event)
+        return _json_response(
+            200,
+            suggest_authors(
+                _first(params.get("q")),
+                limit=_limit(_first(params.get("limit"))),
+                force_refresh=_truthy(_first(params.get("refresh"))),
+            ),
+        )
+
+    if path == "/api/export":
+        params = _query_params(event)
+        export_format = _first(params.get("format")) or "csv"
+        if export_format not in EXPORT_FORMATS:
+            return _json_response(
+                400,
+                {"error": "format must be one of: " + ", ".join(EXPORT_FORMATS)},
+            )
+        content_type, extension = EXPORT_FORMATS[export_format]
+        return _response(
+            200,
+            export_publications(
+                params,
+                export_format,
+                force_refresh=_truthy(_first(params.get("refresh"))),
+            ),
+            content_type,
+            {"Content-Disposition": f'attachment; filename="iisd-ela-publications.{extension}"'},
+        )
+
+    if path == "/api/index":
+        params = _query_params(event)
+        index = get_client_index(force_refresh=_truthy(_first(params.get("refresh"))))
+        headers = {
+            "Cache-Control": "public, max-age=300",
+            "ETag": f'"{index["version"]}"',
+        }
+        if headers["ETag"] in _header(event, "if-none-match"):
+            return _response(304, "", "application/json", headers)
+        return _response(
+            200,
+            json.dumps(index, separators=(",", ":")),
+            "application/json",
+            headers,
+        )
+
+    if path == "/api/batch":
+        params = _query_params(event)
+        try:
+            queries = _batch_queries(event, params, method)
+        except ValueError as error:
+            return _json_response(400, {"error": str(error)})
+        return _json_response(
+            200,
+            search_publications_batch(
+                queries,
+                force_refresh=_truthy(_first(params.get("refresh"))),
+            ),
+        )
+
     return _json_response(404, {"error": "Not found"})
 
 
 def _query_params(event):
     raw_query = event.get("rawQueryString")
     if raw_query is not None:
-        return {
-            key: [value for value in values if value != ""]
-            for key, values in parse_qs(raw_query, keep_blank_values=True).items()
-        }
+        return _parse_query_string(raw_query)
 
     params = event.get("multiValueQueryStringParameters")
     if params:
@@ -70,20 +156,104 @@ def _query_params(event):
     return {key: [value] for key, value in params.items() if value is not None}
 
 
+def _batch_queries(event, params, method):
+    if method == "POST":
+        try:
+            body = json.loads(_body(event) or "{}")
+        except json.JSONDecodeError as error:
+            raise ValueError("Batch request body must be valid JSON") from error
+        queries = body.get("queries") if isinstance(body, dict) else body
+    else:
+        queries = params.get("q", [])
+
+    if isinstance(queries, list):
+        queries = {
+            query: _parse_query_string(query)
+            for query in queries
+            if isinstance(query, str)
+        }
+    elif isinstance(queries, dict):
+        queries = {
+            str(key): _normalize_query_params(value)
+            for key, value in queries.items()
+        }
+    else:
+        raise ValueError("Batch queries must be a list or an object")
+
+    if not queries:
+        raise ValueError("At least one batch query is required")
+    if len(queries) > MAX_BATCH_QUERIES:
+        raise ValueError(f"At most {MAX_BATCH_QUERIES} batch queries are allowed")
+    return queries
+
+
+def _parse_query_string(raw_query):
+    return {
+        key: [value for value in values if value != ""]
+        for key, values in parse_qs(raw_query.lstrip("?"), keep_blank_values=True).items()
+    }
+
+
+def _normalize_query_params(params):
+    if isinstance(params, str):
+        return _parse_query_string(params)
+    if not isinstance(params, dict):
+        raise ValueError("Each batch query must be a query string or an object")
+    return {
+        str(key): [
+            str(value)
+            for value in (values if isinstance(values, list) else [values])
+            if value not in (None, "")
+        ]
+        for key, values in params.items()
+    }
+
+
+def _header(event, name):
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == name:
+            return value or ""
+    return ""
+
+
+def _body(event):
+    body = event.get("body") or ""
+    if event.get("isBase64Encoded"):
+        return base64.b64decode(body).decode("utf-8")
+    return body
+
+
 def _json_response(status_code, payload):
+    return _response(
+        status_code,
+        "" if status_code == 204 else json.dumps(payload),
+        "application/json",
+    )
+
+
+def _response(status_code, body, content_type, extra_headers=None):
     return {
         "statusCode": status_code,
         "headers": {
-            "Content-Type": "application/json",
+            "Content-Type": content_type,
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Headers": "Content-Type",
-            "Access-Control-Allow-Methods": "GET,OPTIONS",
+            "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
             "Cache-Control": "no-store",
+            **(extra_headers or {}),
         },
-        "body": "" if status_code == 204 else json.dumps(payload),
+        "body": body,
     }
 
 
+def _limit(value):
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return AUTHOR_SUGGEST_LIMIT
+    return min(max(limit, 1), MAX_AUTHOR_SUGGEST_LIMIT)
+
+
 def _truthy(value):
     return str(value).lower() in ("1", "true", "yes")
 
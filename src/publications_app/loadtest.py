@@ -0,0 +1,307 @@
+import argparse
+import gzip
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import urlencode, urlparse
+
+from .handler import handler
+
+
+DEBOUNCE_SECONDS = 0.18
+KEYSTROKE_SECONDS = (0.06, 0.3)
+DEFAULT_MIX = {"default": 1, "author": 4, "tags": 2, "typing": 3}
+SEARCH_TERMS = (
+    "acid",
+    "algae",
+    "climate",
+    "cyanobacteria",
+    "experimental lakes",
+    "fish",
+    "lake trout",
+    "mercury",
+    "nanosilver",
+    "nitrogen",
+    "oil",
+    "phosphorus",
+    "plankton",
+    "zooplankton",
+)
+
+
+class HttpTarget:
+    """Sends requests over one keep-alive connection per virtual user."""
+
+    def __init__(self, base_url, timeout=30):
+        parsed = urlparse(base_url)
+        self.connection_class = (
+            http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+        )
+        self.netloc = parsed.netloc
+        self.prefix = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def request(self, path):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self.connection_class(self.netloc, timeout=self.timeout)
+            self._local.connection = connection
+        try:
+            connection.request("GET", self.prefix + path, headers={"Accept-Encoding": "gzip"})
+            response = connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            raise
+        if response.getheader("Connection", "").lower() == "close":
+            connection.close()
+            self._local.connection = None
+        if response.getheader("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        return response.status, body
+
+
+class InProcessTarget:
+    """Calls the Lambda handler directly, without any HTTP layer."""
+
+    def request(self, path):
+        parsed = urlparse(path)
+        response = handler(
+            {
+                "rawPath": parsed.path,
+                "rawQueryString": parsed.query,
+                "requestContext": {"http": {"method": "GET"}},
+            },
+            None,
+        )
+        return response["statusCode"], response.get("body", "").encode("utf-8")
+
+
+def build_session(rng, options, scenario):
+    """Return the (delay_seconds, path) requests one virtual user makes."""
+    if scenario == "default":
+        return [(0, "/api/bootstrap?" + urlencode({"facets": "1"}))]
+
+    if scenario == "author":
+        author = rng.choice(options["authors"])
+        return [(0, "/api/search?" + urlencode({"author_tags": author}))]
+
+    if scenario == "tags":
+        tag_choices = (
+            [("data_type_tags", value) for value in options["data_types"]]
+            + [("env_issue_tags", value) for value in options["environmental_issues"]]
+            + [("lake_tags", value) for value in options["lakes"]]
+            + [("author_tags", value) for value in options["authors"]]
+        )
+        params = rng.sample(tag_choices, k=min(len(tag_choices), rng.randint(1, 3)))
+        if rng.random() < 0.3 and options["year_range"]["min"]:
+            params.append(("year_start", options["year_range"]["min"]))
+        params.append(("facets", "1"))
+        return [(0, "/api/search?" + urlencode(params))]
+
+    if scenario == "typing":
+        term = rng.choice(SEARCH_TERMS)
+        intervals = [rng.uniform(*KEYSTROKE_SECONDS) for _ in term]
+        return [
+            (delay, "/api/search?" + urlencode({"general_search": prefix, "facets": "1"}))
+            for delay, prefix in debounced_prefixes(term, intervals)
+        ]
+
+    raise ValueError(f"Unknown load test scenario: {scenario}")
+
+
+def debounced_prefixes(term, intervals):
+    """Replay typing ``term`` with ``intervals`` between keystrokes.
+
+    Mirrors ``queueSearch`` in ``static/app.js``: a search is only sent once
+    typing pauses for the debounce delay, or after the last keystroke. Returns
+    (seconds since the previous search, prefix) pairs.
+    """
+    prefixes = []
+    elapsed = 0
+    for index in range(len(term)):
+        elapsed += intervals[index]
+        pause = intervals[index + 1] if index + 1 < len(term) else None
+        if pause is None or pause >= DEBOUNCE_SECONDS:
+            prefix = term[: index + 1].strip()
+            if prefix:
+                prefixes.append((elapsed + DEBOUNCE_SECONDS, prefix))
+            elapsed = -DEBOUNCE_SECONDS
+    return prefixes
+
+
+def run_load(target, options, mix, concurrency=8, duration=30, max_requests=None, seed=None, pacing=True):
+    scenarios = list(mix)
+    weights = [mix[scenario] for scenario in scenarios]
+    samples = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    sent = {"count": 0}
+
+    def reserve_request():
+        with lock:
+            if max_requests is not None and sent["count"] >= max_requests:
+                return False
+            sent["count"] += 1
+            return True
+
+    def virtual_user(user_id):
+        rng = random.Random(None if seed is None else seed + user_id)
+        while time.monotonic() < deadline:
+            scenario = rng.choices(scenarios, weights)[0]
+            scheduled = time.monotonic()
+            for delay, path in build_session(rng, options, scenario):
+                # Sends are scheduled from the session start rather than from
+                # the previous response, and latency counts from the scheduled
+                # time, so a slow server cannot lower the offered load.
+                if pacing:
+                    scheduled += delay
+                    pause = scheduled - time.monotonic()
+                    if pause > 0:
+                        time.sleep(pause)
+                else:
+                    scheduled = time.monotonic()
+                if scheduled >= deadline or not reserve_request():
+                    return
+                try:
+                    status, _ = target.request(path)
+                except (OSError, http.client.HTTPException):
+                    status = 0
+                latency = time.monotonic() - scheduled
+                with lock:
+                    samples.append((scenario, status, latency))
+
+    threads = [
+        threading.Thread(target=virtual_user, args=(user_id,), daemon=True)
+        for user_id in range(concurrency)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, time.monotonic() - started)
+
+
+def summarize(samples, elapsed):
+    by_scenario = {}
+    for scenario, status, latency in samples:
+        by_scenario.setdefault(scenario, []).append((status, latency))
+
+    report = {
+        "elapsed_seconds": round(elapsed, 3),
+        "overall": _summarize_group([(status, latency) for _, status, latency in samples], elapsed),
+        "scenarios": {
+            scenario: _summarize_group(group, elapsed)
+            for scenario, group in sorted(by_scenario.items())
+        },
+    }
+    return report
+
+
+def _summarize_group(group, elapsed):
+    latencies = sorted(latency for _, latency in group)
+    return {
+        "requests": len(group),
+        "errors": sum(1 for status, _ in group if not 200 <= status < 400),
+        "throughput_rps": round(len(group) / elapsed, 2) if elapsed else 0,
+        "p50_ms": _percentile_ms(latencies, 50),
+        "p95_ms": _percentile_ms(latencies, 95),
+        "p99_ms": _percentile_ms(latencies, 99),
+    }
+
+
+def _percentile_ms(sorted_latencies, percentile):
+    if not sorted_latencies:
+        return None
+    rank = max(1, -(-len(sorted_latencies) * percentile // 100))
+    return round(sorted_latencies[int(rank) - 1] * 1000, 2)
+
+
+def _parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name!r}")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid weight for {name!r}") from None
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("At least one scenario needs a positive weight")
+    return mix
+
+
+def _print_report(report):
+    print(f"Elapsed: {report['elapsed_seconds']}s")
+    print(
+        f"{'scenario':<10} {'requests':>9} {'errors':>7} {'req/s':>9} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    rows = list(report["scenarios"].items()) + [("overall", report["overall"])]
+    for name, stats in rows:
+        print(
+            f"{name:<10} {stats['requests']:>9} {stats['errors']:>7} "
+            f"{stats['throughput_rps']:>9} {stats['p50_ms']!s:>9} "
+            f"{stats['p95_ms']!s:>9} {stats['p99_ms']!s:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a realistic publications search query mix and report latency."
+    )
+    target_group = parser.add_mutually_exclusive_group()
+    target_group.add_argument("--url", default="http://127.0.0.1:8080")
+    target_group.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Call the Lambda handler directly instead of a running server.",
+    )
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=DEFAULT_MIX,
+        help="Scenario weights, e.g. default=1,author=4,tags=2,typing=3.",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--requests", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--no-pacing",
+        action="store_true",
+        help="Send debounced typing searches back to back instead of at typing speed.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    target = InProcessTarget() if args.in_process else HttpTarget(args.url)
+    status, body = target.request("/api/options?authors=1")
+    if status != 200:
+        raise SystemExit(f"Could not load /api/options (status {status})")
+
+    report = run_load(
+        target,
+        json.loads(body),
+        args.mix,
+        concurrency=max(1, args.concurrency),
+        duration=args.duration,
+        max_requests=args.requests,
+        seed=args.seed,
+        pacing=not args.no_pacing,
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
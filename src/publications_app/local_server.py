@@ -1,70 +1,542 @@
 import argparse
-import json
+import asyncio
+import contextlib
+import gc
+import gzip
+import hashlib
+import logging
 import mimetypes
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from urllib.parse import urlparse
 
+from .google_sheets import freeze_cache
 from .handler import handler
+from .publications import preload_data
 
 
+LOGGER = logging.getLogger(__name__)
 REPO_ROOT = Path(__file__).resolve().parents[2]
 STATIC_ROOT = REPO_ROOT / "static"
+MAX_REQUEST_BODY_BYTES = 1024 * 1024
+MAX_REQUEST_HEADERS = 100
+
+
+class RequestError(Exception):
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+class StaticAssets:
+    def __init__(self, root=STATIC_ROOT):
+        self._assets = {
+            "/" + path.relative_to(root).as_posix(): _load_asset(path)
+            for path in sorted(root.rglob("*"))
+            if path.is_file()
+        }
+
+    def response(self, path, accept_encoding="", if_none_match=""):
+        if path in ("", "/"):
+            path = "/index.html"
+        asset = self._assets.get(path) or self._assets.get("/index.html")
+        if asset is None:
+            return 404, {"Content-Type": "text/plain"}, b"Not found"
+
+        use_gzip = asset["gzip_body"] is not None and "gzip" in accept_encoding.lower()
+        etag = asset["gzip_etag"] if use_gzip else asset["etag"]
+        headers = {
+            "Content-Type": asset["content_type"],
+            "Cache-Control": asset["cache_control"],
+            "ETag": etag,
+        }
+        if asset["gzip_body"] is not None:
+            headers["Vary"] = "Accept-Encoding"
+        if _etag_matches(if_none_match, etag):
+            return 304, headers, b""
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return 200, headers, asset["gzip_body"]
+        return 200, headers, asset["body"]
+
+
+def _load_asset(path):
+    body = path.read_bytes()
+    gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+    if len(gzip_body) >= len(body):
+        gzip_body = None
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    return {
+        "body": body,
+        "gzip_body": gzip_body,
+        "content_type": mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+        "cache_control": "no-cache" if path.name == "index.html" else "public, max-age=60",
+        "etag": f'"{digest}"',
+        "gzip_etag": f'"{digest}-gz"',
+    }
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _api_event(method, parsed, body="", headers=None):
+    return {
+        "rawPath": parsed.path,
+        "rawQueryString": parsed.query,
+        "headers": headers or {},
+        "requestContext": {"http": {"method": method}},
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+def _is_api_path(path):
+    return path.startswith("/api/") or path == "/health"
 
 
 class LocalHandler(BaseHTTPRequestHandler):
+    # When unset, static files are read from disk on every request.
+    static_assets = None
+
     def do_GET(self):
         parsed = urlparse(self.path)
-        if parsed.path.startswith("/api/") or parsed.path == "/health":
+        if _is_api_path(parsed.path):
             self._serve_api(parsed)
             return
         self._serve_static(parsed.path)
 
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        if not parsed.path.startswith("/api/"):
+            self.send_error(405)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        self._serve_api(parsed, self.rfile.read(length).decode("utf-8"))
+
     def do_OPTIONS(self):
         self._serve_api(urlparse(self.path))
 
-    def _serve_api(self, parsed):
-        response = handler(
-            {
-                "rawPath": parsed.path,
-                "rawQueryString": parsed.query,
-                "requestContext": {"http": {"method": self.command}},
-            },
-            None,
-        )
+    def _serve_api(self, parsed, body=""):
+        headers = {key.lower(): value for key, value in self.headers.items()}
+        response = handler(_api_event(self.command, parsed, body, headers), None)
+        body = response.get("body", "").encode("utf-8")
         self.send_response(response["statusCode"])
         for key, value in response.get("headers", {}).items():
             self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        body = response.get("body", "")
         if body:
-            self.wfile.write(body.encode("utf-8"))
+            self.wfile.write(body)
 
     def _serve_static(self, path):
-        if path in ("", "/"):
-            path = "/index.html"
-        target = (STATIC_ROOT / path.lstrip("/")).resolve()
-        if STATIC_ROOT not in target.parents and target != STATIC_ROOT:
-            self.send_error(404)
-            return
-        if not target.exists() or not target.is_file():
-            target = STATIC_ROOT / "index.html"
-        content_type = mimetypes.guess_type(target.name)[0] or "application/octet-stream"
-        self.send_response(200)
-        self.send_header("Content-Type", content_type)
+        if self.static_assets is None:
+            status, headers, body = _read_static_file(path)
+        else:
+            status, headers, body = self.static_assets.response(
+                path,
+                accept_encoding=self.headers.get("Accept-Encoding", ""),
+                if_none_match=self.headers.get("If-None-Match", ""),
+            )
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        self.wfile.write(target.read_bytes())
+        self.wfile.write(body)
+
+
+def _read_static_file(path, root=STATIC_ROOT):
+    if path in ("", "/"):
+        path = "/index.html"
+    target = (root / path.lstrip("/")).resolve()
+    if root not in target.parents and target != root:
+        return 404, {"Content-Type": "text/plain"}, b"Not found"
+    if not target.exists() or not target.is_file():
+        target = root / "index.html"
+    content_type = mimetypes.guess_type(target.name)[0] or "application/octet-stream"
+    return 200, {"Content-Type": content_type}, target.read_bytes()
+
+
+class AsyncServer:
+    def __init__(self, static_assets, api_workers=4, keep_alive_timeout=15):
+        self.static_assets = static_assets
+        self.keep_alive_timeout = keep_alive_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=api_workers,
+            thread_name_prefix="publications-api",
+        )
+        self._api_slots = asyncio.Semaphore(api_workers)
+        self._connections = 0
+        self._closing = False
+
+    async def start(self, host=None, port=None, **kwargs):
+        return await asyncio.start_server(self.handle_connection, host, port, **kwargs)
+
+    async def drain(self, timeout):
+        # Stop keeping connections alive and wait for open ones to finish.
+        self._closing = True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._connections and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle_connection(self, reader, writer):
+        self._connections += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        _read_request(reader),
+                        timeout=self.keep_alive_timeout,
+                    )
+                except RequestError as error:
+                    await _write_response(writer, "GET", error.status, {}, b"", keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                status, headers, body = await self._respond(request)
+                keep_alive = request["keep_alive"] and not self._closing
+                await _write_response(
+                    writer,
+                    request["method"],
+                    status,
+                    headers,
+                    body,
+                    keep_alive=keep_alive,
+                )
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            # ValueError covers request lines longer than the stream reader limit.
+            pass
+        finally:
+            self._connections -= 1
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _respond(self, request):
+        parsed = urlparse(request["target"])
+        method = request["method"]
+        if _is_api_path(parsed.path) and method in ("GET", "POST", "OPTIONS"):
+            event = _api_event(
+                method,
+                parsed,
+                request["body"].decode("utf-8"),
+                request["headers"],
+            )
+            async with self._api_slots:
+                response = await asyncio.get_running_loop().run_in_executor(
+                    self._executor,
+                    handler,
+                    event,
+                    None,
+                )
+            return (
+                response["statusCode"],
+                dict(response.get("headers", {})),
+                response.get("body", "").encode("utf-8"),
+            )
+        if method in ("GET", "HEAD") and not _is_api_path(parsed.path):
+            return self.static_assets.response(
+                parsed.path,
+                accept_encoding=request["headers"].get("accept-encoding", ""),
+                if_none_match=request["headers"].get("if-none-match", ""),
+            )
+        return 405, {"Content-Type": "text/plain"}, b"Method not allowed"
+
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise RequestError(400) from None
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_REQUEST_HEADERS:
+            raise RequestError(431)
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise RequestError(411)
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise RequestError(400) from None
+    if length > MAX_REQUEST_BODY_BYTES:
+        raise RequestError(413)
+    body = await reader.readexactly(length) if length else b""
+
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.1":
+        keep_alive = connection != "close"
+    else:
+        keep_alive = connection == "keep-alive"
+    return {
+        "method": method.upper(),
+        "target": target,
+        "headers": headers,
+        "body": body,
+        "keep_alive": keep_alive,
+    }
+
+
+async def _write_response(writer, method, status, headers, body, keep_alive):
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    lines.extend(f"{key}: {value}" for key, value in headers.items())
+    if status not in (204, 304):
+        lines.append(f"Content-Length: {len(body)}")
+    else:
+        body = b""
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    if body and method != "HEAD":
+        writer.write(body)
+    await writer.drain()
+
+
+async def _serve_async(host, port, api_workers, sock=None):
+    server = AsyncServer(StaticAssets(), api_workers=api_workers)
+    if sock is None:
+        listener = await server.start(host, port)
+    else:
+        listener = await server.start(sock=sock)
+    stopping = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopping.set)
+    try:
+        await stopping.wait()
+        listener.close()
+        await server.drain(server.keep_alive_timeout + 5)
+    finally:
+        server.close()
+
+
+def _serve_threaded(host, port, sock=None, static_assets=None):
+    LocalHandler.static_assets = static_assets
+    if sock is None:
+        server = ThreadingHTTPServer((host, port), LocalHandler)
+    else:
+        server = _WorkerHTTPServer(sock.getsockname()[:2], LocalHandler, bind_and_activate=False)
+        server.socket.close()
+        server.socket = sock
+    signal.signal(
+        signal.SIGTERM,
+        lambda signum, frame: threading.Thread(target=server.shutdown).start(),
+    )
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+class _WorkerHTTPServer(ThreadingHTTPServer):
+    # Join in-flight request threads when a worker is retired.
+    daemon_threads = False
+
+
+class WorkerPool:
+    # The parent owns Google Sheets refreshes and replaces the workers when the
+    # data changes, so workers only ever serve the corpus they were forked with.
+
+    def __init__(self, sock, size, serve_worker):
+        self.sock = sock
+        self.size = size
+        self.serve_worker = serve_worker
+        self.workers = set()
+        self.retiring = set()
+        self.stopping = False
+        self._refresh = None
+
+    def start(self):
+        _freeze_heap()
+        while len(self.workers) < self.size:
+            self._spawn()
+
+    def start_refresh(self):
+        if self._refresh is not None:
+            return False
+        result = {}
+
+        def run():
+            try:
+                result["data"] = preload_data(force_refresh=True)
+            except Exception:
+                LOGGER.exception("Publications refresh failed; keeping current workers")
+
+        thread = threading.Thread(target=run, name="publications-refresh", daemon=True)
+        self._refresh = (thread, result)
+        thread.start()
+        return True
+
+    def finish_refresh(self, data):
+        if self._refresh is None or self._refresh[0].is_alive():
+            return data
+        _, result = self._refresh
+        self._refresh = None
+        refreshed = result.get("data")
+        if refreshed is None or (
+            refreshed["publications"] == data["publications"]
+            and refreshed["authors"] == data["authors"]
+        ):
+            return data
+
+        previous = self.workers
+        self.workers = set()
+        self.start()
+        self._signal(previous, signal.SIGTERM)
+        self.retiring |= previous
+        return refreshed
+
+    def reap(self):
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.retiring.discard(pid)
+            if pid in self.workers:
+                self.workers.discard(pid)
+                if not self.stopping:
+                    LOGGER.warning("Publications worker %s exited; starting a replacement", pid)
+                    self._spawn()
+
+    def stop(self):
+        self.stopping = True
+        self._signal(self.workers | self.retiring, signal.SIGTERM)
+        for pid in self.workers | self.retiring:
+            with contextlib.suppress(ChildProcessError):
+                os.waitpid(pid, 0)
+        self.workers.clear()
+        self.retiring.clear()
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                parent = os.getppid()
+                # refresh=1 requests ask the parent to refresh instead of being ignored.
+                freeze_cache(on_refresh=lambda: self._signal([parent], signal.SIGHUP))
+                self.serve_worker(self.sock)
+            except BaseException:
+                LOGGER.exception("Publications worker failed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.workers.add(pid)
+
+    @staticmethod
+    def _signal(pids, signum):
+        for pid in pids:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signum)
+
+
+def _freeze_heap():
+    # Move the loaded corpus out of the collector's reach so that garbage
+    # collection in the workers does not touch, and copy, the shared pages.
+    gc.unfreeze()
+    gc.collect()
+    gc.freeze()
+
+
+def _serve_prefork(args):
+    if not hasattr(os, "fork"):
+        raise SystemExit("--workers requires a platform with os.fork")
+
+    sock = socket.create_server((args.host, args.port), backlog=socket.SOMAXCONN)
+    data = preload_data()
+
+    def serve_worker(worker_sock):
+        if args.mode == "asyncio":
+            asyncio.run(_serve_async(None, None, args.api_workers, worker_sock))
+        else:
+            _serve_threaded(None, None, worker_sock, StaticAssets())
+
+    pool = WorkerPool(sock, args.workers, serve_worker)
+
+    state = {"stop": False, "refresh": False}
+    signal.signal(signal.SIGTERM, lambda signum, frame: state.update(stop=True))
+    signal.signal(signal.SIGINT, lambda signum, frame: state.update(stop=True))
+    signal.signal(signal.SIGHUP, lambda signum, frame: state.update(refresh=True))
+
+    refresh_interval = int(os.getenv("PUBLICATIONS_CACHE_TTL_SECONDS", "300"))
+    next_refresh = time.monotonic() + refresh_interval
+    pool.start()
+    try:
+        while not state["stop"]:
+            time.sleep(0.5)
+            pool.reap()
+            if state["refresh"] or time.monotonic() >= next_refresh:
+                state["refresh"] = False
+                next_refresh = time.monotonic() + refresh_interval
+                pool.start_refresh()
+            data = pool.finish_refresh(data)
+    finally:
+        pool.stop()
+        sock.close()
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--mode",
+        choices=("threaded", "asyncio"),
+        default="threaded",
+        help="Serve with one thread per connection or an asyncio keep-alive server.",
+    )
+    parser.add_argument(
+        "--api-workers",
+        type=int,
+        default=4,
+        help="Maximum concurrent API calls in asyncio mode.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of forked server processes sharing one loaded corpus.",
+    )
     args = parser.parse_args()
+    args.api_workers = max(1, args.api_workers)
 
-    server = ThreadingHTTPServer((args.host, args.port), LocalHandler)
     print(f"Serving publications search on http://{args.host}:{args.port}")
-    server.serve_forever()
+    if args.workers > 1:
+        _serve_prefork(args)
+    elif args.mode == "asyncio":
+        asyncio.run(_serve_async(args.host, args.port, args.api_workers))
+    else:
+        _serve_threaded(args.host, args.port)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .publications import author_profile_slug, get_author_profiles
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "static" / "authors"
+
+
+def write_author_profiles(output_dir, force_refresh=False):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    _remove_previous_profiles(output_dir)
+
+    profiles = get_author_profiles(force_refresh=force_refresh)
+    authors_by_slug = {}
+    for author in profiles:
+        authors_by_slug.setdefault(author_profile_slug(author), []).append(author)
+
+    generated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    manifest = {"generated_at": generated_at, "authors": {}}
+    for slug, authors in sorted(authors_by_slug.items()):
+        # Authors whose names collapse to the same file name are left to the API.
+        if not slug or len(authors) > 1:
+            continue
+        author = authors[0]
+        filename = f"{slug}.json"
+        _write_json(
+            output_dir / filename,
+            {"author": author, "generated_at": generated_at, **profiles[author]},
+        )
+        manifest["authors"][author] = filename
+
+    _write_json(output_dir / "manifest.json", manifest)
+    return manifest
+
+
+def _remove_previous_profiles(output_dir):
+    manifest_path = output_dir / "manifest.json"
+    if not manifest_path.exists():
+        return
+    previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+    for filename in previous.get("authors", {}).values():
+        (output_dir / Path(filename).name).unlink(missing_ok=True)
+
+
+def _write_json(path, payload):
+    path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pre-render author profile search results as static JSON files."
+    )
+    parser.add_argument("--output-dir", default=str(DEFAULT_OUTPUT_DIR))
+    parser.add_argument("--refresh", action="store_true")
+    args = parser.parse_args()
+
+    manifest = write_author_profiles(args.output_dir, force_refresh=args.refresh)
+    print(f"Wrote {len(manifest['authors'])} author profiles to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,18 @@
+import csv
+import hashlib
 import html
+import io
+import json
 import math
 import os
+import re
+import unicodedata
+from bisect import bisect_left
 
 from .config import (
+    AUTHOR_SUGGEST_LIMIT,
     AUTHOR_TYPE_OPTIONS,
+    CLIENT_INDEX_SEARCH_COLUMNS,
     DATA_TYPES,
     ENVIRONMENTAL_ISSUES,
     IGNORED_GENERAL_SEARCH_COLUMNS,
@@ -11,23 +20,112 @@ from .config import (
 from .google_sheets import get_sheet_rows
 
 
-def get_options(force_refresh=False):
+# One (payload, data) tuple, replaced as a whole so readers never pair a new
+# payload with data normalized from the previous one.
+_NORMALIZED_CACHE = {"entry": (None, None)}
+_CASE_FOLDS = {}
+
+
+def get_options(force_refresh=False, include_authors=False):
+    data = _load_normalized_data(force_refresh=force_refresh)
+    return _options(data, include_authors=include_authors)
+
+
+def get_bootstrap(params, force_refresh=False):
+    data = _load_normalized_data(force_refresh=force_refresh)
+    return {
+        "options": _options(data),
+        "search": _search(data, params),
+    }
+
+
+def preload_data(force_refresh=False):
+    data = _load_normalized_data(force_refresh=force_refresh)
+    _author_index(data)
+    _client_index(data)
+    return data
+
+
+def search_publications(params, force_refresh=False):
+    data = _load_normalized_data(force_refresh=force_refresh)
+    return _search(data, params)
+
+
+def search_publications_batch(queries, force_refresh=False):
+    data = _load_normalized_data(force_refresh=force_refresh)
+    return {
+        "results": {
+            key: _search(data, params)
+            for key, params in queries.items()
+        }
+    }
+
+
+def export_publications(params, export_format, force_refresh=False):
+    data = _load_normalized_data(force_refresh=force_refresh)
+    rows = _filter_publications(data["publications"], params)
+    exporters = {"csv": _export_csv, "bibtex": _export_bibtex, "ris": _export_ris}
+    return exporters[export_format](rows)
+
+
+def get_client_index(force_refresh=False):
+    data = _load_normalized_data(force_refresh=force_refresh)
+    return _client_index(data)
+
+
+def get_author_profiles(force_refresh=False):
     data = _load_normalized_data(force_refresh=force_refresh)
-    publications = data["publications"]
     return {
+        author: _search(data, {"author_tags": [author]})
+        for author in data["authors"]
+    }
+
+
+def suggest_authors(query, limit=AUTHOR_SUGGEST_LIMIT, force_refresh=False):
+    prefix = _author_index_key(query)
+    if not prefix:
+        return {"authors": []}
+
+    keys, names = _author_index(_load_normalized_data(force_refresh=force_refresh))
+    authors = []
+    index = bisect_left(keys, prefix)
+    while index < len(keys) and keys[index].startswith(prefix) and len(authors) < limit:
+        authors.append(names[index])
+        index += 1
+    return {"authors": authors}
+
+
+def author_profile_slug(author):
+    return re.sub(r"[^a-z0-9]+", "-", _normalize_author_query(author).lower()).strip("-")
+
+
+def _options(data, include_authors=False):
+    publications = data["publications"]
+    options = {
         "data_types": DATA_TYPES,
         "environmental_issues": ENVIRONMENTAL_ISSUES,
         "author_type_options": AUTHOR_TYPE_OPTIONS,
-        "authors": data["authors"],
         "lakes": _unique_lakes(publications),
         "year_range": _year_range(publications),
     }
+    # The search page finds authors through /api/authors/suggest instead.
+    if include_authors:
+        options["authors"] = data["authors"]
+    return options
 
 
-def search_publications(params, force_refresh=False):
-    data = _load_normalized_data(force_refresh=force_refresh)
-    publications = data["publications"]
+def _search(data, params):
+    results = _filter_publications(data["publications"], params)
+    payload = {
+        "count": len(results),
+        "results": [_format_result(row) for row in results],
+    }
+    if str(_first(params.get("facets"))).lower() in ("1", "true", "yes"):
+        payload["facets"] = _facet_counts(results, data["authors"])
+    return payload
 
+
+def _filter_publications(publications, params):
     data_type_query = params.get("data_type_tags", [])
     env_issue_query = params.get("env_issue_tags", [])
     lake_query = params.get("lake_tags", [])
@@ -86,16 +184,41 @@ def search_publications(params, force_refresh=False):
     elif author_type == AUTHOR_TYPE_OPTIONS[3]:
         results = [row for row in results if row.get("type") in ("msc", "phd")]
 
-    results = sorted(results, key=lambda row: (row.get("authors", ""), row.get("year", "")))
-    return {
-        "count": len(results),
-        "results": [_format_result(row) for row in results],
+    return sorted(results, key=lambda row: (row.get("authors", ""), row.get("year", "")))
+
+
+def _facet_counts(results, authors):
+    author_names = {_normalize_author_query(author): author for author in authors}
+    counts = {
+        "data_types": {},
+        "environmental_issues": {},
+        "lakes": {},
+        "authors": {},
     }
+    for row in results:
+        for facet, column in (
+            ("data_types", "data_type_tags"),
+            ("environmental_issues", "environmental_issue_tags"),
+            ("lakes", "lake_tags"),
+        ):
+            for tag in _split_tags(row.get(column)):
+                counts[facet][tag] = counts[facet].get(tag, 0) + 1
+        row_authors = {
+            author_names.get(_normalize_author_query(part))
+            for part in _split_tags(row.get("authors"))
+        }
+        for author in row_authors - {None}:
+            counts["authors"][author] = counts["authors"].get(author, 0) + 1
+    return counts
 
 
 def _load_normalized_data(force_refresh=False):
     cache_ttl = int(os.getenv("PUBLICATIONS_CACHE_TTL_SECONDS", "300"))
     payload = get_sheet_rows(cache_ttl_seconds=cache_ttl, force_refresh=force_refresh)
+    source, cached = _NORMALIZED_CACHE["entry"]
+    if source is payload:
+        return cached
+
     publications = [
         _normalize_publication(row)
         for row in payload["publications"]
@@ -108,7 +231,119 @@ def _load_normalized_data(force_refresh=False):
             if row.get("authors", "").strip()
         }
     )
-    return {"publications": publications, "authors": authors}
+    data = {"publications": publications, "authors": authors}
+    _NORMALIZED_CACHE["entry"] = (payload, data)
+    return data
+
+
+def _author_index(data):
+    if "author_index" not in data:
+        # Sheet authors take precedence over spellings found only in publications.
+        names_by_key = {}
+        for author in data["authors"]:
+            names_by_key.setdefault(_author_index_key(author), author)
+        for row in data["publications"]:
+            for part in _split_tags(row.get("authors")):
+                author = part.removeprefix("& ").strip()
+                names_by_key.setdefault(_author_index_key(author), author)
+        names_by_key.pop("", None)
+        keys = sorted(names_by_key)
+        data["author_index"] = (keys, [names_by_key[key] for key in keys])
+    return data["author_index"]
+
+
+def _client_index(data):
+    if "client_index" not in data:
+        data["client_index"] = _build_client_index(data)
+    return data["client_index"]
+
+
+def _build_client_index(data):
+    # Rows are [citation_html, tag_info, year, author_group, search_text] in
+    # result order; postings hold delta-encoded row numbers per tag.
+    rows = _filter_publications(data["publications"], {})
+    postings = {
+        "data_type_tags": {},
+        "env_issue_tags": {},
+        "lake_tags": {},
+        "author_tags": {},
+    }
+    publications = []
+    for row_number, row in enumerate(rows):
+        result = _format_result(row)
+        publications.append(
+            [
+                result["citation_html"],
+                result["tag_info"],
+                row.get("year", ""),
+                _author_group(row),
+                "\n".join(
+                    str(row[column]).casefold()
+                    for column in CLIENT_INDEX_SEARCH_COLUMNS
+                    if str(row.get(column, ""))
+                ),
+            ]
+        )
+        for facet, column in (
+            ("data_type_tags", "data_type_tags"),
+            ("env_issue_tags", "environmental_issue_tags"),
+            ("lake_tags", "lake_tags"),
+        ):
+            for tag in _split_tags(row.get(column)):
+                postings[facet].setdefault(tag, []).append(row_number)
+        authors = {
+            _normalize_author_query(part) for part in str(row.get("authors") or "").split("; ")
+        }
+        for author in authors - {""}:
+            postings["author_tags"].setdefault(author, []).append(row_number)
+
+    content = {
+        "case_folds": _case_folds(),
+        "options": _options(data, include_authors=True),
+        "publications": publications,
+        "postings": {
+            facet: {tag: _delta_encode(row_numbers) for tag, row_numbers in sorted(tags.items())}
+            for facet, tags in postings.items()
+        },
+    }
+    serialized = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return {
+        "format": 2,
+        "version": hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16],
+        **content,
+    }
+
+
+def _case_folds():
+    # Characters whose casefold() differs from lower(); with this table the
+    # client can fold search text exactly like the API does.
+    if not _CASE_FOLDS:
+        folds = {}
+        for code_point in range(0x110000):
+            char = chr(code_point)
+            if char.casefold() != char.lower():
+                folds[char] = char.casefold()
+        _CASE_FOLDS.update(folds)
+    return _CASE_FOLDS
+
+
+def _author_group(row):
+    if row.get("type") in ("msc", "phd"):
+        return 3
+    return {"authored": 1, "supported": 2}.get(row.get("relationship_to_iisd_ela"), 0)
+
+
+def _delta_encode(row_numbers):
+    previous = 0
+    deltas = []
+    for row_number in row_numbers:
+        deltas.append(row_number - previous)
+        previous = row_number
+    return deltas
+
+
+def _author_index_key(value):
+    return _normalize_author_query(value).casefold()
 
 
 def _normalize_publication(row):
@@ -132,6 +367,10 @@ def _matches_any_tag_query(row, data_type_query, env_issue_query, lake_query, au
     )
 
 
+def _split_tags(value):
+    return {part.strip() for part in str(value or "").split("; ") if part.strip()}
+
+
 def _has_any(value, queries):
     values = {part.strip() for part in str(value or "").split("; ")}
     return any(str(query).strip() in values for query in queries)
@@ -179,38 +418,32 @@ def _format_result(row):
 
 
 def _format_citation(row):
-    publication_type = row.get("type")
-    authors = _escape(row.get("authors", "").replace(";", ","))
-    year = _escape(row.get("year", ""))
-    title = _escape(row.get("title", ""))
-    doi_or_url = _link_or_text(row.get("doi_or_url", ""))
-
-    if publication_type == "journal":
-        journal = _escape(row.get("journal_name", ""))
-        volume = _int_string(row.get("journal_vol_no"))
-        issue = _int_string(row.get("journal_issue_no"))
-        pages = str(row.get("journal_page_range", "")).strip()
+    fields = _citation_fields(row)
+    authors = _escape(fields["authors_text"])
+    year = _escape(fields["year"])
+    title = _escape(fields["title"])
+    doi_or_url = _link_or_text(fields["doi_or_url"])
+
+    if fields["type"] == "journal":
+        journal = _escape(fields["journal"])
         citation = f"{authors} ({year}). {title}. <em>{journal}</em>"
-        if volume:
-            citation += f", <em>{_escape(volume)}</em>"
-        if issue:
-            citation += f"({_escape(issue)})"
-        if pages:
-            citation += f", {_escape(pages)}"
+        if fields["volume"]:
+            citation += f", <em>{_escape(fields['volume'])}</em>"
+        if fields["issue"]:
+            citation += f"({_escape(fields['issue'])})"
+        if fields["pages"]:
+            citation += f", {_escape(fields['pages'])}"
         citation += "."
         if doi_or_url:
             citation += f" {doi_or_url}"
         return citation
 
-    if publication_type in ("msc", "phd"):
-        dissertation_type = (
-            "Doctoral dissertation" if publication_type == "phd" else "Master of Science dissertation"
-        )
-        university = _escape(row.get("thesis_uni", ""))
-        database = _escape(row.get("thesis_db", ""))
+    if fields["type"] in ("msc", "phd"):
+        university = _escape(fields["university"])
+        database = _escape(fields["database"])
         citation = (
             f"{authors} ({year}). <em>{title}</em> "
-            f"[{dissertation_type}, {university}]."
+            f"[{fields['dissertation_type']}, {university}]."
         )
         if database:
             citation += f" {database}."
@@ -221,6 +454,166 @@ def _format_citation(row):
     return f"{authors} ({year}). {title}. {doi_or_url}".strip()
 
 
+def _citation_fields(row):
+    publication_type = row.get("type")
+    authors = str(row.get("authors", ""))
+    return {
+        "type": publication_type,
+        "authors_text": authors.replace(";", ","),
+        "authors": [
+            part.strip().removeprefix("& ").strip()
+            for part in authors.split(";")
+            if part.strip()
+        ],
+        "year": str(row.get("year", "")).strip(),
+        "title": str(row.get("title", "")).strip(),
+        "doi_or_url": str(row.get("doi_or_url", "")).strip(),
+        "journal": str(row.get("journal_name", "")).strip(),
+        "volume": _int_string(row.get("journal_vol_no")),
+        "issue": _int_string(row.get("journal_issue_no")),
+        "pages": str(row.get("journal_page_range", "")).strip(),
+        "dissertation_type": (
+            "Doctoral dissertation" if publication_type == "phd" else "Master of Science dissertation"
+        ),
+        "university": str(row.get("thesis_uni", "")).strip(),
+        "database": str(row.get("thesis_db", "")).strip(),
+    }
+
+
+EXPORT_CSV_COLUMNS = (
+    "authors",
+    "year",
+    "title",
+    "type",
+    "journal",
+    "volume",
+    "issue",
+    "pages",
+    "university",
+    "database",
+    "doi_or_url",
+    "data_type_tags",
+    "environmental_issue_tags",
+    "lake_tags",
+)
+RIS_TYPES = {"journal": "JOUR", "msc": "THES", "phd": "THES"}
+BIBTEX_TYPES = {"journal": "article", "msc": "mastersthesis", "phd": "phdthesis"}
+BIBTEX_ESCAPES = {
+    "\\": r"\textbackslash{}",
+    "{": r"\{",
+    "}": r"\}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+}
+
+
+def _export_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_CSV_COLUMNS)
+    for row in rows:
+        fields = _citation_fields(row)
+        fields["authors"] = "; ".join(fields["authors"])
+        for column in ("data_type_tags", "environmental_issue_tags", "lake_tags"):
+            fields[column] = row.get(column, "")
+        writer.writerow([fields[column] for column in EXPORT_CSV_COLUMNS])
+    return buffer.getvalue()
+
+
+def _export_bibtex(rows):
+    used_keys = set()
+    entries = []
+    for row in rows:
+        fields = _citation_fields(row)
+        doi = _doi(fields["doi_or_url"])
+        entry = [
+            ("author", " and ".join(fields["authors"])),
+            ("title", fields["title"]),
+            ("year", fields["year"]),
+        ]
+        if fields["type"] == "journal":
+            entry += [
+                ("journal", fields["journal"]),
+                ("volume", fields["volume"]),
+                ("number", fields["issue"]),
+                ("pages", re.sub(r"(?<=\d)\s*[-\u2013]\s*(?=\d)", "--", fields["pages"])),
+            ]
+        elif fields["type"] in ("msc", "phd"):
+            entry += [("school", fields["university"]), ("note", fields["database"])]
+        entry.append(("doi", doi) if doi else ("url", fields["doi_or_url"]))
+
+        lines = [f"@{BIBTEX_TYPES.get(fields['type'], 'misc')}{{{_bibtex_key(fields, used_keys)},"]
+        lines += [f"  {name} = {{{_bibtex_escape(value)}}}," for name, value in entry if value]
+        entries.append("\n".join(lines) + "\n}\n\n")
+    return "".join(entries)
+
+
+def _bibtex_key(fields, used_keys):
+    surname = fields["authors"][0].split(",", 1)[0] if fields["authors"] else "publication"
+    ascii_surname = unicodedata.normalize("NFKD", surname).encode("ascii", "ignore").decode()
+    base = (re.sub(r"[^A-Za-z0-9]", "", ascii_surname) or "publication") + fields["year"]
+    key = base
+    suffix = 0
+    while key in used_keys:
+        suffix += 1
+        key = f"{base}{_alphabetic_suffix(suffix)}"
+    used_keys.add(key)
+    return key
+
+
+def _alphabetic_suffix(number):
+    suffix = ""
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        suffix = chr(ord("a") + remainder) + suffix
+    return suffix
+
+
+def _bibtex_escape(value):
+    return "".join(BIBTEX_ESCAPES.get(char, char) for char in " ".join(value.split()))
+
+
+def _export_ris(rows):
+    entries = []
+    for row in rows:
+        fields = _citation_fields(row)
+        doi = _doi(fields["doi_or_url"])
+        entry = [("TY", RIS_TYPES.get(fields["type"], "GEN"))]
+        entry += [("AU", author) for author in fields["authors"]]
+        entry += [("PY", fields["year"]), ("TI", fields["title"])]
+        if fields["type"] == "journal":
+            pages = re.split(r"\s*[-\u2013]\s*", fields["pages"], maxsplit=1)
+            start_page, end_page = (pages + [""])[:2]
+            entry += [
+                ("T2", fields["journal"]),
+                ("VL", fields["volume"]),
+                ("IS", fields["issue"]),
+                ("SP", start_page),
+                ("EP", end_page),
+            ]
+        elif fields["type"] in ("msc", "phd"):
+            entry += [
+                ("M3", fields["dissertation_type"]),
+                ("PB", fields["university"]),
+                ("DB", fields["database"]),
+            ]
+        entry.append(("DO", doi) if doi else ("UR", fields["doi_or_url"]))
+
+        lines = [f"{tag}  - {' '.join(value.split())}" for tag, value in entry if value]
+        entries.append("\r\n".join(lines + ["ER  - "]) + "\r\n\r\n")
+    return "".join(entries)
+
+
+def _doi(value):
+    match = re.match(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)?(10\.\S+)$", value, re.IGNORECASE)
+    return match.group(1) if match else ""
+
+
 def _year_string(value):
     if value in (None, ""):
         return ""
@@ -0,0 +1,338 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from .config import AUTHORS_WORKSHEET, DATA_TYPES, ENVIRONMENTAL_ISSUES, PUBLICATIONS_WORKSHEET
+
+
+BATCH_GET_PATH = re.compile(r"^/v4/spreadsheets/(?P<spreadsheet_id>[^/]+)/values:batchGet$")
+PUBLICATION_COLUMNS = (
+    "approved",
+    "authors",
+    "year",
+    "title",
+    "type",
+    "data_type_tags",
+    "environmental_issue_tags",
+    "lake_tags",
+    "relationship_to_iisd_ela",
+    "journal_name",
+    "journal_vol_no",
+    "journal_issue_no",
+    "journal_page_range",
+    "thesis_uni",
+    "thesis_db",
+    "doi_or_url",
+)
+DEFAULT_FAULTS = {
+    "latency_ms": 0.0,
+    "jitter_ms": 0.0,
+    "error_rate": 0.0,
+    "error_status": 503,
+    "timeout_rate": 0.0,
+    "hang_seconds": 60.0,
+    "rate_limit": 0,
+    "rate_window_seconds": 60.0,
+}
+ERROR_STATUSES = {
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    502: "UNAVAILABLE",
+    503: "UNAVAILABLE",
+    504: "DEADLINE_EXCEEDED",
+}
+
+
+class SheetsEmulator:
+    """In-memory stand-in for the Google Sheets ``values:batchGet`` API."""
+
+    def __init__(self, sheets, faults=None, seed=None):
+        self.sheets = sheets
+        self.faults = {**DEFAULT_FAULTS, **_coerce_faults(faults or {})}
+        self.stats = {"requests": 0, "statuses": {}}
+        self._random = random.Random(seed)
+        self._window = {"started_at": time.monotonic(), "count": 0}
+        self._lock = threading.Lock()
+
+    def update_faults(self, faults):
+        faults = _coerce_faults(faults)
+        with self._lock:
+            self.faults.update(faults)
+            return dict(self.faults)
+
+    def batch_get(self, ranges):
+        """Return ``(status, headers, payload, delay_seconds)`` for one request."""
+        with self._lock:
+            faults = dict(self.faults)
+            self.stats["requests"] += 1
+            roll = self._random.random()
+            delay = max(0, faults["latency_ms"] + self._random.uniform(-1, 1) * faults["jitter_ms"])
+            rate_limited = self._consume_rate_limit(faults)
+
+        delay /= 1000
+        if roll < faults["timeout_rate"]:
+            return self._record(504, {}, _error_payload(504), delay + faults["hang_seconds"])
+        if rate_limited:
+            retry_after = {"Retry-After": str(int(faults["rate_window_seconds"]))}
+            return self._record(429, retry_after, _error_payload(429), delay)
+        if roll < faults["timeout_rate"] + faults["error_rate"]:
+            status = int(faults["error_status"])
+            return self._record(status, {}, _error_payload(status), delay)
+
+        value_ranges = []
+        for range_name in ranges:
+            sheet_name = range_name.split("!", 1)[0].strip("'")
+            if sheet_name not in self.sheets:
+                message = f"Unable to parse range: {range_name}"
+                return self._record(400, {}, _error_payload(400, message), delay)
+            values = self.sheets[sheet_name]
+            last_cell = f"{_column_name(values)}{max(len(values), 1)}"
+            value_ranges.append(
+                {
+                    "range": f"{_quote_sheet_name(sheet_name)}!A1:{last_cell}",
+                    "majorDimension": "ROWS",
+                    "values": values,
+                }
+            )
+        return self._record(200, {}, {"valueRanges": value_ranges}, delay)
+
+    def _consume_rate_limit(self, faults):
+        if not faults["rate_limit"]:
+            return False
+        now = time.monotonic()
+        if now - self._window["started_at"] >= faults["rate_window_seconds"]:
+            self._window.update(started_at=now, count=0)
+        self._window["count"] += 1
+        return self._window["count"] > faults["rate_limit"]
+
+    def _record(self, status, headers, payload, delay):
+        with self._lock:
+            statuses = self.stats["statuses"]
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        return status, headers, payload, delay
+
+
+def _coerce_faults(faults):
+    if not isinstance(faults, dict):
+        raise ValueError("Fault settings must be a JSON object")
+    unknown = set(faults) - set(DEFAULT_FAULTS)
+    if unknown:
+        raise ValueError("Unknown fault settings: " + ", ".join(sorted(unknown)))
+
+    coerced = {}
+    for name, value in faults.items():
+        expected = type(DEFAULT_FAULTS[name])
+        try:
+            coerced[name] = expected(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be a {expected.__name__}") from None
+    if coerced.get("error_status", 503) not in ERROR_STATUSES:
+        raise ValueError(
+            "error_status must be one of: " + ", ".join(str(status) for status in ERROR_STATUSES)
+        )
+    return coerced
+
+
+def _error_payload(status, message=None):
+    return {
+        "error": {
+            "code": status,
+            "message": message or f"Injected emulator error ({status})",
+            "status": ERROR_STATUSES.get(status, "INVALID_ARGUMENT"),
+        }
+    }
+
+
+def _quote_sheet_name(sheet_name):
+    return sheet_name if sheet_name.isalnum() else f"'{sheet_name}'"
+
+
+def _column_name(values):
+    width = max((len(row) for row in values), default=1)
+    name = ""
+    while width:
+        width, remainder = divmod(width - 1, 26)
+        name = chr(ord("A") + remainder) + name
+    return name
+
+
+def load_fixture(path):
+    """Load sheets from JSON mapping sheet names to value rows or record objects."""
+    fixture = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {name: records_to_values(rows) for name, rows in fixture.items()}
+
+
+def records_to_values(rows):
+    if not rows or not isinstance(rows[0], dict):
+        return [[str(value) for value in row] for row in rows]
+    headers = list(dict.fromkeys(key for row in rows for key in row))
+    return [headers] + [[str(row.get(header, "")) for header in headers] for row in rows]
+
+
+def synthetic_sheets(publication_count=1000, author_count=150, seed=0):
+    """Generate publication and author sheets shaped like the production workbook."""
+    rng = random.Random(seed)
+    authors = sorted(
+        {
+            f"{rng.choice(_SURNAMES)}{index}, {rng.choice('ABCDEFGHJKLMNPRSTW')}. "
+            f"{rng.choice('ABCDEFGHJKLMNPRSTW')}."
+            for index in range(author_count)
+        }
+    )
+    lakes = [str(lake) for lake in (110, 114, 224, 226, 227, 239, 240, 260, 302, 373, 632, 658)]
+
+    rows = [list(PUBLICATION_COLUMNS)]
+    for index in range(publication_count):
+        publication_type = rng.choices(("journal", "report", "msc", "phd"), (70, 15, 10, 5))[0]
+        record = {
+            "approved": rng.choices(("Yes", "Not applicable", "No"), (85, 10, 5))[0],
+            "authors": "; ".join(rng.sample(authors, k=min(len(authors), rng.randint(1, 6)))),
+            "year": str(rng.randint(1968, 2026)),
+            "title": f"Synthetic study {index} of {rng.choice(_TOPICS)}",
+            "type": publication_type,
+            "data_type_tags": "; ".join(rng.sample(DATA_TYPES, k=rng.randint(1, 3))),
+            "environmental_issue_tags": "; ".join(
+                rng.sample(ENVIRONMENTAL_ISSUES, k=rng.randint(1, 2))
+            ),
+            "lake_tags": "; ".join(rng.sample(lakes, k=rng.randint(1, 3)))
+            if rng.random() < 0.8
+            else "Other or Unspecified",
+            "relationship_to_iisd_ela": rng.choice(("authored", "supported")),
+            "journal_name": f"Journal of {rng.choice(_TOPICS).title()}",
+            "journal_vol_no": f"{rng.randint(1, 80)}.0",
+            "journal_issue_no": f"{rng.randint(1, 12)}.0",
+            "journal_page_range": f"{rng.randint(1, 400)}-{rng.randint(401, 900)}",
+            "thesis_uni": rng.choice(
+                ("University of Manitoba", "Lakehead University", "Trent University")
+            ),
+            "thesis_db": "ProQuest Dissertations",
+            "doi_or_url": f"https://doi.org/10.0000/synthetic.{index}",
+        }
+        rows.append([record[column] for column in PUBLICATION_COLUMNS])
+
+    author_rows = [["authors"]] + [[author] for author in rng.sample(authors, k=len(authors) // 2)]
+    return {PUBLICATIONS_WORKSHEET: rows, AUTHORS_WORKSHEET: author_rows}
+
+
+_SURNAMES = (
+    "Blanchfield",
+    "Findlay",
+    "Hecky",
+    "Higgins",
+    "Kidd",
+    "Paterson",
+    "Rudd",
+    "Schindler",
+    "Sandilands",
+    "Tonin",
+)
+_TOPICS = (
+    "algal blooms",
+    "boreal lakes",
+    "cyanobacteria",
+    "lake trout",
+    "mercury cycling",
+    "nanosilver",
+    "oil spills",
+    "phosphorus loading",
+    "whole-lake experiments",
+    "zooplankton",
+)
+
+
+class EmulatorHandler(BaseHTTPRequestHandler):
+    emulator = None
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path == "/_emulator/stats":
+            self._send_json(200, self.emulator.stats)
+            return
+        if not BATCH_GET_PATH.match(parsed.path):
+            self._send_json(404, _error_payload(404, "Requested entity was not found."))
+            return
+
+        ranges = parse_qs(parsed.query).get("ranges", [])
+        status, headers, payload, delay = self.emulator.batch_get(ranges)
+        if delay:
+            time.sleep(delay)
+        self._send_json(status, payload, headers)
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/_emulator/faults":
+            self._send_json(404, _error_payload(404, "Requested entity was not found."))
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            faults = self.emulator.update_faults(json.loads(self.rfile.read(length) or b"{}"))
+        except ValueError as error:
+            self._send_json(400, _error_payload(400, str(error)))
+            return
+        self._send_json(200, faults)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up, usually after an injected hang exceeded its timeout.
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(emulator, host="127.0.0.1", port=8090):
+    handler_class = type("BoundEmulatorHandler", (EmulatorHandler,), {"emulator": emulator})
+    return ThreadingHTTPServer((host, port), handler_class)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve a local Google Sheets values:batchGet emulator with fault injection."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--fixture", help="JSON file mapping sheet names to rows or records.")
+    parser.add_argument("--publications", type=int, default=1000)
+    parser.add_argument("--authors", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, choices=sorted(ERROR_STATUSES), default=503)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=60)
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests allowed per window.")
+    parser.add_argument("--rate-window-seconds", type=float, default=60)
+    args = parser.parse_args()
+
+    sheets = (
+        load_fixture(args.fixture)
+        if args.fixture
+        else synthetic_sheets(args.publications, args.authors, seed=args.seed)
+    )
+    emulator = SheetsEmulator(
+        sheets,
+        faults={fault: getattr(args, fault) for fault in DEFAULT_FAULTS},
+        seed=args.seed,
+    )
+    server = make_server(emulator, args.host, args.port)
+    print(f"Serving Google Sheets emulator on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
 const API_BASE = "/api";
+const AUTHOR_PROFILES_BASE = "/authors";
 const API_RETRY_DELAYS_MS = [600, 1600, 3200];
+const AUTHOR_SUGGEST_LIMIT = 20;
+const CLIENT_INDEX_FORMAT = 2;
+const CLIENT_SEARCH =
+  document.documentElement.dataset.searchMode === "client" ||
+  new URLSearchParams(window.location.search).get("search_mode") === "client";
 
 try {
   if (window.self !== window.top) {
@@ -16,6 +22,21 @@ const SELECTS = {
   author_tags: document.getElementById("author-tags"),
 };
 
+const FACETS = {
+  data_type_tags: "data_types",
+  env_issue_tags: "environmental_issues",
+  lake_tags: "lakes",
+  author_tags: "authors",
+};
+
+const SEARCH_PARAM_KEYS = [
+  ...Object.keys(SELECTS),
+  "author_type",
+  "year_start",
+  "year_end",
+  "general_search",
+];
+
 const authorType = document.getElementById("author-type");
 const yearStart = document.getElementById("year-start");
 const yearEnd = document.getElementById("year-end");
@@ -35,6 +56,8 @@ const scientistDisclaimer = document.getElementById("scientist-disclaimer");
 
 let debounceTimer;
 let searchRequestId = 0;
+let clientIndex = null;
+let lastFacets = null;
 const dropdowns = new Map();
 
 document.addEventListener("DOMContentLoaded", init);
@@ -57,21 +80,65 @@ async function init() {
   searchView.hidden = false;
   scientistView.hidden = true;
   try {
-    await loadOptions();
+    if (CLIENT_SEARCH) await loadClientIndex(query);
+    if (!clientIndex) await loadBootstrap(query);
     wireInputs();
-    await runSearch();
   } catch (error) {
     setStatus("Could not load publications data. Please try again.", true);
   }
 }
 
-async function loadOptions() {
+async function loadBootstrap(query) {
+  setStatus("Loading publications data...");
+  const params = initialSearchParams(query);
+  const payload = await getJson(`${API_BASE}/bootstrap?${params}`);
+  loadOptions(payload.options);
+  applySearchParams(params);
+  renderSearchPayload(payload.search);
+}
+
+async function loadClientIndex(query) {
   setStatus("Loading publications data...");
-  const options = await getJson(`${API_BASE}/options`);
+  try {
+    clientIndex = decodeClientIndex(await getJson(`${API_BASE}/index`));
+  } catch (error) {
+    clientIndex = null;
+    return;
+  }
+  const params = initialSearchParams(query);
+  loadOptions(clientIndex.options);
+  applySearchParams(params);
+  renderSearchPayload(searchClientIndex(clientIndex, params));
+}
+
+function initialSearchParams(query) {
+  const params = new URLSearchParams();
+  for (const [key, value] of query) {
+    if (SEARCH_PARAM_KEYS.includes(key) && value.trim()) params.append(key, value.trim());
+  }
+  params.set("facets", "1");
+  return params;
+}
+
+function applySearchParams(params) {
+  for (const [key, select] of Object.entries(SELECTS)) {
+    const dropdown = dropdowns.get(select);
+    const values = params.getAll(key);
+    if (dropdown.search) renderTypeaheadOptions(dropdown, values, []);
+    for (const input of dropdown.inputs) input.checked = values.includes(input.value);
+    updateMultiSelectLabel(dropdown);
+  }
+  if (params.has("author_type")) authorType.value = params.get("author_type");
+  yearStart.value = params.get("year_start") || "";
+  yearEnd.value = params.get("year_end") || "";
+  generalSearch.value = params.get("general_search") || "";
+}
+
+function loadOptions(options) {
   fillMultiSelect(SELECTS.data_type_tags, options.data_types);
   fillMultiSelect(SELECTS.env_issue_tags, options.environmental_issues);
   fillMultiSelect(SELECTS.lake_tags, options.lakes);
-  fillMultiSelect(SELECTS.author_tags, options.authors);
+  fillAuthorTypeahead(SELECTS.author_tags);
   fillSelect(authorType, options.author_type_options);
   yearRangeEl.textContent = `Current year range: ${options.year_range.min}-${options.year_range.max}`;
 }
@@ -101,6 +168,24 @@ function queueSearch() {
 
 async function runSearch() {
   const requestId = ++searchRequestId;
+  const params = searchParams();
+  if (clientIndex) {
+    renderSearchPayload(searchClientIndex(clientIndex, params));
+    return;
+  }
+
+  setStatus("Loading...");
+  try {
+    const payload = await getJson(`${API_BASE}/search?${params}`);
+    if (requestId !== searchRequestId) return;
+    renderSearchPayload(payload);
+  } catch (error) {
+    if (requestId !== searchRequestId) return;
+    setStatus("Search failed. Please try again.", true);
+  }
+}
+
+function searchParams() {
   const params = new URLSearchParams();
   appendSelected(params, "data_type_tags", SELECTS.data_type_tags);
   appendSelected(params, "env_issue_tags", SELECTS.env_issue_tags);
@@ -115,18 +200,87 @@ async function runSearch() {
   if (generalSearch.value.trim()) {
     params.set("general_search", generalSearch.value.trim());
   }
+  params.set("facets", "1");
+  return params;
+}
 
-  setStatus("Loading...");
-  try {
-    const payload = await getJson(`${API_BASE}/search?${params}`);
-    if (requestId !== searchRequestId) return;
-    resultsTitle.textContent = `Search Results (${payload.count})`;
-    renderResults(resultsEl, payload.results);
-    setStatus(payload.count === 0 ? "No publications were found for your search." : "");
-  } catch (error) {
-    if (requestId !== searchRequestId) return;
-    setStatus("Search failed. Please try again.", true);
+function decodeClientIndex(index) {
+  if (index.format !== CLIENT_INDEX_FORMAT) throw new Error(`Unsupported index format ${index.format}`);
+  const postings = {};
+  for (const [key, tags] of Object.entries(index.postings)) {
+    postings[key] = new Map();
+    for (const [tag, deltas] of Object.entries(tags)) {
+      let rowNumber = 0;
+      postings[key].set(tag, deltas.map((delta) => (rowNumber += delta)));
+    }
   }
+  return { ...index, postings };
+}
+
+// Mirrors search_publications: selected tags widen the results (OR), while
+// years, general search, and author type narrow them.
+function searchClientIndex(index, params) {
+  let candidates = null;
+  for (const key of Object.keys(SELECTS)) {
+    for (const value of params.getAll(key)) {
+      const tag = key === "author_tags" ? normalizeAuthorKey(value) : value.trim();
+      candidates = candidates || new Set();
+      for (const rowNumber of index.postings[key].get(tag) || []) candidates.add(rowNumber);
+    }
+  }
+
+  const yearStart = params.get("year_start") || "";
+  const yearEnd = params.get("year_end") || "";
+  const needle = foldSearchText(params.get("general_search") || "", index.case_folds);
+  const authorGroup = index.options.author_type_options.indexOf(params.get("author_type"));
+  const matches = [];
+  index.publications.forEach(([, , year, group, searchText], rowNumber) => {
+    if (candidates && !candidates.has(rowNumber)) return;
+    if (yearStart && year < yearStart) return;
+    if (yearEnd && year > yearEnd) return;
+    if (needle && !searchText.includes(needle)) return;
+    if (authorGroup > 0 && group !== authorGroup) return;
+    matches.push(rowNumber);
+  });
+
+  return {
+    count: matches.length,
+    results: matches.map((rowNumber) => {
+      const [citationHtml, tagInfo] = index.publications[rowNumber];
+      return { citation_html: citationHtml, tag_info: tagInfo };
+    }),
+    facets: clientFacetCounts(index, new Set(matches)),
+  };
+}
+
+// Matches Python's str.casefold(): characters that fold differently from
+// their lowercase form come from the index's case_folds table.
+function foldSearchText(value, caseFolds) {
+  return Array.from(value, (char) => caseFolds[char] ?? char.toLowerCase()).join("");
+}
+
+function clientFacetCounts(index, matches) {
+  const countMatches = (posting = []) =>
+    posting.reduce((total, rowNumber) => total + (matches.has(rowNumber) ? 1 : 0), 0);
+  const facets = {};
+  for (const [key, facet] of Object.entries(FACETS)) {
+    facets[facet] = {};
+    if (key === "author_tags") {
+      for (const author of index.options.authors) {
+        facets[facet][author] = countMatches(index.postings[key].get(normalizeAuthorKey(author)));
+      }
+    } else {
+      for (const [tag, posting] of index.postings[key]) facets[facet][tag] = countMatches(posting);
+    }
+  }
+  return facets;
+}
+
+function renderSearchPayload(payload) {
+  resultsTitle.textContent = `Search Results (${payload.count})`;
+  renderResults(resultsEl, payload.results);
+  updateFacetCounts(payload.facets);
+  setStatus(payload.count === 0 ? "No publications were found for your search." : "");
 }
 
 async function renderScientist(author) {
@@ -140,7 +294,8 @@ async function renderScientist(author) {
   const params = new URLSearchParams();
   params.append("author_tags", author);
   try {
-    const payload = await getJson(`${API_BASE}/search?${params}`);
+    const payload =
+      (await getAuthorProfile(author)) || (await getJson(`${API_BASE}/search?${params}`));
     renderResults(scientistResults, payload.results);
     scientistStatus.textContent =
       payload.count === 0 ? "No publications were found for your search." : "";
@@ -198,6 +353,39 @@ async function getJson(url) {
   throw lastError;
 }
 
+async function getAuthorProfile(author) {
+  const slug = authorProfileSlug(author);
+  if (!slug) return null;
+  try {
+    const response = await fetch(`${AUTHOR_PROFILES_BASE}/${slug}.json`, {
+      headers: { Accept: "application/json" },
+    });
+    const contentType = response.headers.get("Content-Type") || "";
+    if (!response.ok || !contentType.includes("json")) return null;
+    // Slugs drop punctuation and case, so a file may belong to another spelling.
+    const payload = await response.json();
+    return normalizeAuthorKey(payload.author) === normalizeAuthorKey(author) ? payload : null;
+  } catch (error) {
+    return null;
+  }
+}
+
+function authorProfileSlug(author) {
+  return normalizeAuthorKey(author)
+    .toLowerCase()
+    .replace(/[^a-z0-9]+/g, "-")
+    .replace(/^-+|-+$/g, "");
+}
+
+function normalizeAuthorKey(value) {
+  return String(value || "")
+    .replace(/& /g, "")
+    .trim()
+    .replace(/;+$/g, "")
+    .trim()
+    .replace(/\./g, "");
+}
+
 function normalizeAuthorParam(value) {
   return String(value || "")
     .trim()
@@ -240,36 +428,120 @@ function fillMultiSelect(container, values) {
   menu.className = "multi-menu";
   menu.hidden = true;
 
-  const inputs = [];
-  values.forEach((value, index) => {
-    const option = document.createElement("label");
-    option.className = "multi-option";
+  trigger.append(label, chevron);
+  container.replaceChildren(trigger, menu);
 
-    const checkbox = document.createElement("input");
-    checkbox.type = "checkbox";
-    checkbox.value = value;
-    checkbox.id = `${container.id}-${index}`;
-    checkbox.addEventListener("change", () => {
-      updateMultiSelectLabel(dropdown);
-      queueSearch();
-    });
+  const dropdown = { container, trigger, label, menu, list: menu, inputs: [] };
+  values.forEach((value, index) => menu.appendChild(createMultiOption(dropdown, value, index)));
+  dropdowns.set(container, dropdown);
+  updateMultiSelectLabel(dropdown);
 
-    const text = document.createElement("span");
-    text.textContent = value;
+  trigger.addEventListener("click", () => toggleDropdown(dropdown));
+  return dropdown;
+}
 
-    option.append(checkbox, text);
-    menu.appendChild(option);
-    inputs.push(checkbox);
+function createMultiOption(dropdown, value, index, checked = false) {
+  const option = document.createElement("label");
+  option.className = "multi-option";
+
+  const checkbox = document.createElement("input");
+  checkbox.type = "checkbox";
+  checkbox.value = value;
+  checkbox.checked = checked;
+  checkbox.id = `${dropdown.container.id}-${index}`;
+  checkbox.addEventListener("change", () => {
+    updateMultiSelectLabel(dropdown);
+    queueSearch();
   });
 
-  trigger.append(label, chevron);
-  container.replaceChildren(trigger, menu);
+  const text = document.createElement("span");
+  text.textContent = value;
 
-  const dropdown = { container, trigger, label, menu, inputs };
-  dropdowns.set(container, dropdown);
+  option.append(checkbox, text);
+  dropdown.inputs.push(checkbox);
+  return option;
+}
+
+// The author list is too long to ship with the page, so authors are found by
+// name prefix and only the selected ones stay in the menu.
+function fillAuthorTypeahead(container) {
+  const dropdown = fillMultiSelect(container, []);
+  const search = document.createElement("input");
+  search.type = "search";
+  search.className = "multi-search";
+  search.placeholder = "Type an author name";
+  search.autocomplete = "off";
+  search.setAttribute("aria-label", "Find authors");
+
+  const list = document.createElement("div");
+  dropdown.menu.append(search, list);
+  Object.assign(dropdown, { search, list, suggestRequestId: 0, suggestTimer: null });
+
+  search.addEventListener("input", () => {
+    window.clearTimeout(dropdown.suggestTimer);
+    dropdown.suggestTimer = window.setTimeout(() => suggestInto(dropdown), 180);
+  });
+  dropdown.trigger.addEventListener("click", () => {
+    if (!dropdown.menu.hidden) search.focus();
+  });
+}
+
+async function suggestInto(dropdown) {
+  const requestId = ++dropdown.suggestRequestId;
+  const query = dropdown.search.value.trim();
+  let suggestions = [];
+  if (query) {
+    try {
+      suggestions = await suggestAuthors(query);
+    } catch (error) {
+      suggestions = [];
+    }
+  }
+  if (requestId !== dropdown.suggestRequestId) return;
+  renderTypeaheadOptions(dropdown, selectedValues(dropdown), suggestions);
+}
+
+async function suggestAuthors(query) {
+  if (clientIndex) {
+    const prefix = normalizeAuthorKey(query).toLowerCase();
+    return clientIndex.options.authors
+      .filter((author) => normalizeAuthorKey(author).toLowerCase().startsWith(prefix))
+      .slice(0, AUTHOR_SUGGEST_LIMIT);
+  }
+  const params = new URLSearchParams({ q: query, limit: String(AUTHOR_SUGGEST_LIMIT) });
+  const payload = await getJson(`${API_BASE}/authors/suggest?${params}`);
+  return payload.authors;
+}
+
+function renderTypeaheadOptions(dropdown, selected, suggestions) {
+  const values = [...selected, ...suggestions.filter((value) => !selected.includes(value))];
+  dropdown.inputs = [];
+  dropdown.list.replaceChildren(
+    ...values.map((value, index) => createMultiOption(dropdown, value, index, selected.includes(value)))
+  );
   updateMultiSelectLabel(dropdown);
+  updateFacetCounts(lastFacets);
+}
 
-  trigger.addEventListener("click", () => toggleDropdown(dropdown));
+function selectedValues(dropdown) {
+  return dropdown.inputs.filter((input) => input.checked).map((input) => input.value);
+}
+
+function updateFacetCounts(facets) {
+  if (!facets) return;
+  lastFacets = facets;
+  for (const [key, select] of Object.entries(SELECTS)) {
+    const dropdown = dropdowns.get(select);
+    if (!dropdown) continue;
+    const counts = facets[FACETS[key]] || {};
+    for (const input of dropdown.inputs) {
+      const text = input.nextElementSibling;
+      // Suggestions can include authors missing from the authors sheet, which
+      // have no facet count.
+      if (dropdown.search && !(input.value in counts)) delete text.dataset.count;
+      else text.dataset.count = counts[input.value] || 0;
+    }
+  }
 }
 
 function appendSelected(params, key, select) {
@@ -303,9 +575,7 @@ function closeDropdownsOnOutsideClick(event) {
 }
 
 function updateMultiSelectLabel(dropdown) {
-  const selected = dropdown.inputs
-    .filter((input) => input.checked)
-    .map((input) => input.value);
+  const selected = selectedValues(dropdown);
 
   dropdown.trigger.classList.toggle("has-selection", selected.length > 0);
   if (selected.length === 0) {
@@ -131,7 +131,7 @@ test.describe("publications search", () => {
 
     const app = page.frameLocator("#publications-frame");
     await expect(app.locator("#results-title")).toHaveText(/Search Results \(\d+\)/, { timeout: 90000 });
-    await expect(app.locator("#author-tags .multi-option").first()).toBeAttached({ timeout: 90000 });
+    await expect(app.locator("#data-type-tags .multi-option").first()).toBeAttached({ timeout: 90000 });
     await expect(app.locator("html")).toHaveClass(/is-embedded/);
     await expect(app.locator(".app-shell")).toHaveCSS("padding-top", "0px");
   });
@@ -156,9 +156,73 @@ test.describe("publications search", () => {
     await expect(page.locator("#scientist-results .result-item").first()).toContainText("Hayhurst");
   });
 
+  test("ignores pre-rendered profiles that belong to another author spelling", async ({ page }) => {
+    let searchRequests = 0;
+    await page.route(/\/authors\/[^/]+\.json$/, (route) =>
+      route.fulfill({
+        status: 200,
+        contentType: "application/json",
+        body: JSON.stringify({
+          author: "Hayhurst, L. D.",
+          count: 1,
+          results: [{ citation_html: "Pre-rendered profile for Hayhurst, L. D. (2020).", tag_info: "" }]
+        })
+      })
+    );
+    await page.route(/\/api\/search\?/, (route) => {
+      searchRequests += 1;
+      return route.fulfill({
+        status: 200,
+        contentType: "application/json",
+        body: JSON.stringify({
+          count: 1,
+          results: [{ citation_html: "API results for Hayhurst, L.-D. (2021).", tag_info: "" }]
+        })
+      });
+    });
+
+    // "Hayhurst, L.-D." shares the hayhurst-l-d file name with the sheet author above.
+    await page.goto(`${APP_URL}?author_tags=Hayhurst%2C+L.-D.`, { waitUntil: "domcontentloaded" });
+    await waitForApp(page, true);
+    await waitForStableAppResults(page, true);
+
+    await expect(page.locator("#scientist-results .result-item").first()).toContainText("API results");
+    expect(searchRequests).toBe(1);
+  });
+
+  test("finds authors with the typeahead instead of loading every author", async ({ page }) => {
+    const suggestQueries = [];
+    page.on("request", (request) => {
+      const url = new URL(request.url());
+      if (url.pathname.endsWith("/api/authors/suggest")) suggestQueries.push(url.searchParams.get("q"));
+    });
+    const bootstrap = page.waitForResponse(/\/api\/bootstrap(\?|$)/);
+
+    await page.goto(APP_URL, { waitUntil: "domcontentloaded" });
+    const bootstrapPayload = await (await bootstrap).json();
+    await waitForApp(page, false);
+
+    expect(bootstrapPayload.options.authors).toBeUndefined();
+    await expect(page.locator("#author-tags .multi-option")).toHaveCount(0);
+
+    const field = page.locator("#author-tags");
+    await field.locator(".multi-trigger").click();
+    await field.locator(".multi-search").fill("Pater");
+    const option = field.locator(".multi-option", { hasText: "Paterson, M. J." }).locator("input");
+    await expect(option).toBeAttached({ timeout: 90000 });
+    expect(suggestQueries).toContain("Pater");
+
+    await option.check({ force: true });
+    await page.keyboard.press("Escape");
+    await waitForStableAppResults(page);
+
+    await expect(field.locator(".multi-label")).toHaveText("Paterson, M. J.");
+    await expect(page.locator(".result-item").first()).toContainText("Paterson");
+  });
+
   test("retries transient API failures while loading options", async ({ page }) => {
     let optionAttempts = 0;
-    await page.route("**/api/options", async (route) => {
+    await page.route(/\/api\/bootstrap(\?|$)/, async (route) => {
       optionAttempts += 1;
       if (optionAttempts === 1) {
         await route.fulfill({
@@ -241,7 +305,7 @@ async function runAppCase(page, filters) {
     await applyNewMultiSelect(page, "#data-type-tags", filters.dataTypes);
     await applyNewMultiSelect(page, "#env-issue-tags", filters.environmentalIssues);
     await applyNewMultiSelect(page, "#lake-tags", filters.lakes);
-    await applyNewMultiSelect(page, "#author-tags", filters.authors);
+    await applyNewAuthorTypeahead(page, filters.authors);
     await applyNewSelect(page, "#author-type", filters.authorType);
     await applyNewTextInput(page, "#year-start", filters.yearStart);
     await applyNewTextInput(page, "#year-end", filters.yearEnd);
@@ -264,7 +328,7 @@ async function waitForApp(page, isScientistProfile) {
   }
 
   await expect(page.locator("#results-title")).toHaveText(/Search Results \(\d+\)/, { timeout: 90000 });
-  await expect(page.locator("#author-tags .multi-option").first()).toBeAttached({ timeout: 90000 });
+  await expect(page.locator("#data-type-tags .multi-option").first()).toBeAttached({ timeout: 90000 });
   await page.waitForFunction(
     () => !document.querySelector("#status")?.textContent?.includes("Loading"),
     null,
@@ -307,6 +371,18 @@ async function applyNewMultiSelect(page, selector, values = []) {
   }
 }
 
+async function applyNewAuthorTypeahead(page, authors = []) {
+  for (const author of authors || []) {
+    const field = page.locator("#author-tags");
+    await field.locator(".multi-trigger").click();
+    await field.locator(".multi-search").fill(author.slice(0, 5));
+    const option = field.locator(".multi-option", { hasText: author }).locator("input");
+    await expect(option).toBeAttached({ timeout: 90000 });
+    await option.check({ force: true });
+    await page.keyboard.press("Escape");
+  }
+}
+
 async function applyNewSelect(page, selector, value) {
   if (!value) return;
   await expect(page.locator(`${selector} option`, { hasText: value })).toBeAttached({ timeout: 90000 });
@@ -1,10 +1,24 @@
+import asyncio
+import csv
+import gzip
+import io
 import json
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
 
 from requests import RequestException
 
 from publications_app import google_sheets
 from publications_app import handler as handler_module
+from publications_app import loadtest
+from publications_app import local_server
+from publications_app import prerender
 from publications_app import publications
+from publications_app import sheets_emulator
 
 
 PUBLICATION_ROWS = [
@@ -68,9 +82,10 @@ def fake_sheet_rows(cache_ttl_seconds=300, force_refresh=False):
 def test_options_are_normalized_from_approved_publications(monkeypatch):
     monkeypatch.setattr(publications, "get_sheet_rows", fake_sheet_rows)
 
-    options = publications.get_options()
+    options = publications.get_options(include_authors=True)
 
     assert options["authors"] == ["Paterson, M. J.", "Student, S."]
+    assert "authors" not in publications.get_options()
     assert options["lakes"] == ["239", "Other or Unspecified"]
     assert options["year_range"] == {"min": "2020", "max": "2021"}
 
@@ -209,7 +224,7 @@ def test_empty_refresh_query_does_not_error(monkeypatch):
     monkeypatch.setattr(
         handler_module,
         "get_options",
-        lambda force_refresh=False: {"force_refresh": force_refresh},
+        lambda force_refresh=False, include_authors=False: {"force_refresh": force_refresh},
     )
 
     response = handler_module.handler(
@@ -236,3 +251,573 @@ def test_removed_data_alias_returns_not_found():
     )
 
     assert response["statusCode"] == 404
+
+
+def test_batch_search_loads_data_once_and_keys_results_by_query(monkeypatch):
+    calls = []
+
+    def counting_sheet_rows(cache_ttl_seconds=300, force_refresh=False):
+        calls.append(force_refresh)
+        return fake_sheet_rows()
+
+    monkeypatch.setattr(publications, "get_sheet_rows", counting_sheet_rows)
+
+    response = handler_module.handler(
+        {
+            "rawPath": "/api/batch",
+            "rawQueryString": (
+                "q=author_tags%3DPaterson%2C+M.+J."
+                "&q=author_type%3DStudents+%28theses%29"
+            ),
+            "requestContext": {"http": {"method": "GET"}},
+        },
+        None,
+    )
+    results = json.loads(response["body"])["results"]
+
+    assert response["statusCode"] == 200
+    assert calls == [False]
+    assert results["author_tags=Paterson, M. J."]["count"] == 1
+    assert results["author_type=Students (theses)"]["count"] == 1
+
+
+def test_batch_search_accepts_json_post_body(monkeypatch):
+    monkeypatch.setattr(publications, "get_sheet_rows", fake_sheet_rows)
+
+    response = handler_module.handler(
+        {
+            "rawPath": "/api/batch",
+            "rawQueryString": "",
+            "requestContext": {"http": {"method": "POST"}},
+            "body": json.dumps(
+                {
+                    "queries": {
+                        "fish": {"data_type_tags": "Fish"},
+                        "student": {"author_tags": ["Student, S."]},
+                    }
+                }
+            ),
+        },
+        None,
+    )
+    results = json.loads(response["body"])["results"]
+
+    assert response["statusCode"] == 200
+    assert results["fish"]["count"] == 1
+    assert "Mercury thesis" in results["student"]["results"][0]["citation_html"]
+
+
+def test_batch_search_answers_cors_preflight():
+    response = handler_module.handler(
+        {
+            "rawPath": "/api/batch",
+            "rawQueryString": "",
+            "requestContext": {"http": {"method": "OPTIONS"}},
+        },
+        None,
+    )
+
+    assert response["statusCode"] == 204
+    assert "POST" in response["headers"]["Access-Control-Allow-Methods"]
+    assert response["headers"]["Access-Control-Allow-Headers"] == "Content-Type"
+
+
+def test_batch_search_rejects_missing_queries():
+    response = handler_module.handler(
+        {
+            "rawPath": "/api/batch",
+            "rawQueryString": "",
+            "requestContext": {"http": {"method": "GET"}},
+        },
+        None,
+    )
+
+    assert response["statusCode"] == 400
+
+
+def test_facet_counts_cover_current_result_set(monkeypatch):
+    monkeypatch.setattr(publications, "get_sheet_rows", fake_sheet_rows)
+
+    plain = publications.search_publications({"lake_tags": ["239"]})
+    result = publications.search_publications({"facets": ["1"]})
+
+    assert "facets" not in plain
+    assert result["facets"] == {
+        "data_types": {"Fish": 1, "Chemistry": 1},
+        "environmental_issues": {"Climate Change": 1, "Mercury": 1},
+        "lakes": {"239": 1, "Other or Unspecified": 1},
+        "authors": {"Paterson, M. J.": 1, "Student, S.": 1},
+    }
+
+
+def test_bootstrap_returns_options_and_initial_search_from_one_load(monkeypatch):
+    calls = []
+
+    def counting_sheet_rows(cache_ttl_seconds=300, force_refresh=False):
+        calls.append(force_refresh)
+        return fake_sheet_rows()
+
+    monkeypatch.setattr(publications, "get_sheet_rows", counting_sheet_rows)
+
+    response = handler_module.handler(
+        {
+            "rawPath": "/api/bootstrap",
+            "rawQueryString": "data_type_tags=Fish",
+            "requestContext": {"http": {"method": "GET"}},
+        },
+        None,
+    )
+    payload = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert calls == [False]
+    assert "authors" not in payload["options"]
+    assert payload["search"]["count"] == 1
+
+
+def test_prerender_writes_author_profiles_and_manifest(monkeypatch, tmp_path):
+    monkeypatch.setattr(publications, "get_sheet_rows", fake_sheet_rows)
+
+    manifest = prerender.write_author_profiles(tmp_path)
+    profile = json.loads((tmp_path / "paterson-m-j.json").read_text())
+
+    assert manifest["authors"] == {
+        "Paterson, M. J.": "paterson-m-j.json",
+        "Student, S.": "student-s.json",
+    }
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    assert profile["author"] == "Paterson, M. J."
+    assert profile["count"] == 1
+    assert "Fish response" in profile["results"][0]["citation_html"]
+    assert publications.author_profile_slug("Hayhurst, L. D;") == "hayhurst-l-d"
+
+
+def test_author_suggestions_use_prefix_index_with_publication_authors(monkeypatch):
+    monkeypatch.setattr(publications, "get_sheet_rows", fake_sheet_rows)
+
+    response = handler_module.handler(
+        {
+            "rawPath": "/api/authors/suggest",
+            "rawQueryString": "q=pa",
+            "requestContext": {"http": {"method": "GET"}},
+        },
+        None,
+    )
+
+    assert json.loads(response["body"]) == {"authors": ["Paterson, M. J."]}
+    assert publications.suggest_authors("alpha, a.") == {"authors": ["Alpha, A."]}
+    assert publications.suggest_authors("hidden") == {"authors": []}
+    assert publications.suggest_authors("") == {"authors": []}
+    assert len(publications.suggest_authors("s", limit=1)["authors"]) == 1
+
+
+def test_static_assets_are_cached_compressed_and_etagged(tmp_path):
+    (tmp_path / "index.html").write_text("<html></html>")
+    (tmp_path / "app.js").write_text("console.log('publications');\n" * 50)
+    assets = local_server.StaticAssets(tmp_path)
+
+    status, headers, body = assets.response("/app.js", accept_encoding="gzip, br")
+    revalidated, _, empty = assets.response(
+        "/app.js",
+        accept_encoding="gzip",
+        if_none_match=headers["ETag"],
+    )
+    plain_status, plain_headers, _ = assets.response("/app.js")
+    fallback_status, fallback_headers, _ = assets.response("/missing")
+
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body).startswith(b"console.log")
+    assert (revalidated, empty) == (304, b"")
+    assert plain_status == 200
+    assert "Content-Encoding" not in plain_headers
+    assert plain_headers["ETag"] != headers["ETag"]
+    assert fallback_status == 200
+    assert fallback_headers["Cache-Control"] == "no-cache"
+
+
+def test_threaded_static_files_are_read_from_disk_per_request(tmp_path):
+    (tmp_path / "index.html").write_text("<html></html>")
+    (tmp_path / "app.js").write_text("console.log('before');")
+
+    _, _, before = local_server._read_static_file("/app.js", root=tmp_path)
+    (tmp_path / "app.js").write_text("console.log('after');")
+    status, headers, after = local_server._read_static_file("/app.js", root=tmp_path)
+    _, _, fallback = local_server._read_static_file("/missing", root=tmp_path)
+
+    assert before == b"console.log('before');"
+    assert (status, after) == (200, b"console.log('after');")
+    assert "javascript" in headers["Content-Type"]
+    assert fallback == b"<html></html>"
+
+
+def test_async_server_keeps_connections_alive(monkeypatch, tmp_path):
+    (tmp_path / "index.html").write_text("<html></html>")
+    monkeypatch.setattr(
+        local_server,
+        "handler",
+        lambda event, context: {
+            "statusCode": 200,
+            "headers": {"Content-Type": "application/json"},
+            "body": json.dumps({"path": event["rawPath"]}),
+        },
+    )
+
+    async def exercise_server():
+        server = local_server.AsyncServer(local_server.StaticAssets(tmp_path), api_workers=2)
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        responses = []
+        for path in ("/api/search", "/"):
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            responses.append((head, await reader.readexactly(length)))
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        server.close()
+        return responses
+
+    (api_head, api_body), (static_head, static_body) = asyncio.run(exercise_server())
+
+    assert api_head.startswith(b"HTTP/1.1 200 OK")
+    assert b"Connection: keep-alive" in api_head
+    assert json.loads(api_body) == {"path": "/api/search"}
+    assert b"ETag: " in static_head
+    assert static_body == b"<html></html>"
+
+
+def test_frozen_sheet_cache_is_served_without_refreshing(monkeypatch):
+    cached_payload = {"publications": [], "authors": []}
+    monkeypatch.setitem(google_sheets._CACHE, "value", cached_payload)
+    monkeypatch.setitem(google_sheets._CACHE, "expires_at", 0)
+    monkeypatch.setitem(google_sheets._CACHE, "frozen", False)
+    monkeypatch.setitem(google_sheets._CACHE, "on_refresh", None)
+    refresh_requests = []
+
+    google_sheets.freeze_cache(on_refresh=lambda: refresh_requests.append(True))
+
+    assert google_sheets.get_sheet_rows() is cached_payload
+    assert google_sheets.get_sheet_rows(force_refresh=True) is cached_payload
+    assert refresh_requests == [True]
+
+
+def test_worker_pool_refreshes_in_the_background(monkeypatch):
+    data = {"publications": [], "authors": []}
+    release = threading.Event()
+
+    def slow_preload(force_refresh=False):
+        release.wait(10)
+        return {"publications": [], "authors": []}
+
+    monkeypatch.setattr(local_server, "preload_data", slow_preload)
+    pool = local_server.WorkerPool(None, 1, None)
+
+    assert pool.start_refresh() is True
+    assert pool.start_refresh() is False
+    assert pool.finish_refresh(data) is data
+    release.set()
+    pool._refresh[0].join(10)
+
+    assert pool.finish_refresh(data) is data
+    assert pool.start_refresh() is True
+
+
+def test_worker_pool_serves_from_forked_workers_on_shared_socket(monkeypatch):
+    monkeypatch.setattr(local_server, "freeze_cache", lambda on_refresh=None: None)
+    monkeypatch.setattr(
+        local_server,
+        "handler",
+        lambda event, context: {
+            "statusCode": 200,
+            "headers": {"Content-Type": "application/json"},
+            "body": json.dumps({"pid": os.getpid()}),
+        },
+    )
+    sock = socket.create_server(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    pool = local_server.WorkerPool(
+        sock,
+        2,
+        lambda worker_sock: local_server._serve_threaded(None, None, worker_sock),
+    )
+
+    pool.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=10) as response:
+            payload = json.loads(response.read())
+    finally:
+        workers = set(pool.workers)
+        pool.stop()
+        sock.close()
+
+    assert len(workers) == 2
+    assert payload["pid"] in workers
+    assert pool.workers == set()
+
+
+def test_load_test_typing_follows_search_debounce():
+    intervals = [0.1, 0.1, 0.3, 0.1, 0.05]
+
+    prefixes = loadtest.debounced_prefixes("fish ", intervals)
+
+    assert [(round(delay, 2), prefix) for delay, prefix in prefixes] == [
+        (0.38, "fi"),
+        (0.45, "fish"),
+    ]
+
+
+def test_load_test_reports_latency_percentiles_in_process(monkeypatch):
+    monkeypatch.setattr(publications, "get_sheet_rows", fake_sheet_rows)
+    target = loadtest.InProcessTarget()
+    options = json.loads(target.request("/api/options?authors=1")[1])
+
+    report = loadtest.run_load(
+        target,
+        options,
+        loadtest.DEFAULT_MIX,
+        concurrency=2,
+        duration=10,
+        max_requests=20,
+        seed=1,
+        pacing=False,
+    )
+
+    assert report["overall"]["requests"] == 20
+    assert report["overall"]["errors"] == 0
+    assert report["overall"]["p50_ms"] <= report["overall"]["p99_ms"]
+    assert set(report["scenarios"]) <= set(loadtest.DEFAULT_MIX)
+
+
+def test_load_test_measures_latency_from_scheduled_send_time(monkeypatch):
+    class SlowTarget:
+        def request(self, path):
+            time.sleep(0.2)
+            return 200, b"{}"
+
+    monkeypatch.setattr(
+        loadtest,
+        "build_session",
+        lambda rng, options, scenario: [(0, "/a"), (0.1, "/b"), (0.1, "/c")],
+    )
+
+    report = loadtest.run_load(SlowTarget(), {}, {"typing": 1}, concurrency=1, max_requests=3)
+
+    # The later sends were due while the earlier responses were still pending.
+    assert report["overall"]["requests"] == 3
+    assert report["overall"]["p50_ms"] >= 250
+    assert report["overall"]["p99_ms"] >= 350
+
+
+def _start_sheets_emulator(monkeypatch, emulator):
+    server = sheets_emulator.make_server(emulator, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv(
+        "GOOGLE_SHEETS_API_BASE_URL",
+        f"http://127.0.0.1:{server.server_address[1]}",
+    )
+    monkeypatch.setenv("GOOGLE_SHEETS_EMULATOR", "1")
+    monkeypatch.setenv("GOOGLE_SPREADSHEET_ID", "emulated")
+    monkeypatch.setenv("GOOGLE_SHEETS_MAX_ATTEMPTS", "1")
+    monkeypatch.setitem(google_sheets._CACHE, "value", None)
+    monkeypatch.setitem(google_sheets._CACHE, "expires_at", 0)
+    monkeypatch.setitem(google_sheets._CACHE, "stale_expires_at", 0)
+    monkeypatch.setitem(google_sheets._CACHE, "frozen", False)
+    monkeypatch.setitem(google_sheets._CACHE, "on_refresh", None)
+    return server
+
+
+def test_sheets_emulator_serves_batch_get_to_the_app(monkeypatch):
+    emulator = sheets_emulator.SheetsEmulator(
+        {
+            "Publications": sheets_emulator.records_to_values(PUBLICATION_ROWS),
+            "Current_IISD-ELA_Authors": sheets_emulator.records_to_values(AUTHOR_ROWS),
+        }
+    )
+    server = _start_sheets_emulator(monkeypatch, emulator)
+    try:
+        rows = google_sheets.get_sheet_rows()
+    finally:
+        server.shutdown()
+
+    assert rows["publications"][0]["title"] == "Fish response"
+    assert rows["authors"] == AUTHOR_ROWS
+    assert emulator.stats == {"requests": 1, "statuses": {"200": 1}}
+
+
+def test_sheets_emulator_injected_errors_fall_back_to_stale_cache(monkeypatch):
+    emulator = sheets_emulator.SheetsEmulator(
+        sheets_emulator.synthetic_sheets(publication_count=20, author_count=5),
+        faults={"rate_limit": 1},
+    )
+    server = _start_sheets_emulator(monkeypatch, emulator)
+    try:
+        fresh = google_sheets.get_sheet_rows(cache_ttl_seconds=0)
+        stale = google_sheets.get_sheet_rows(cache_ttl_seconds=0)
+    finally:
+        server.shutdown()
+
+    assert len(fresh["publications"]) == 20
+    assert stale is fresh
+    assert emulator.stats["statuses"] == {"200": 1, "429": 1}
+
+
+def test_sheets_emulator_validates_fault_updates(monkeypatch):
+    emulator = sheets_emulator.SheetsEmulator({"Publications": [["title"]]}, seed=1)
+    server = _start_sheets_emulator(monkeypatch, emulator)
+    url = f"http://127.0.0.1:{server.server_address[1]}/_emulator/faults"
+
+    def post(body):
+        request = urllib.request.Request(url, data=body.encode())
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            return error.code, json.loads(error.read())
+
+    try:
+        rejected = [post(body) for body in ("[1]", '{"latency_ms": "slow"}', '{"error_status": 200}')]
+        accepted = post('{"error_rate": "0.5", "rate_limit": 3}')
+        status, _, _, _ = emulator.batch_get(["Publications"])
+    finally:
+        server.shutdown()
+
+    assert [status for status, _ in rejected] == [400, 400, 400]
+    assert accepted == (200, {**sheets_emulator.DEFAULT_FAULTS, "error_rate": 0.5, "rate_limit": 3})
+    assert status in (200, 503)
+
+
+def test_custom_sheets_base_url_keeps_google_credentials(monkeypatch):
+    monkeypatch.setenv("GOOGLE_SHEETS_API_BASE_URL", "https://sheets-proxy.example.org")
+    monkeypatch.delenv("GOOGLE_SHEETS_EMULATOR", raising=False)
+    monkeypatch.setattr(google_sheets, "get_google_credentials_info", lambda: {})
+    monkeypatch.setattr(
+        google_sheets.service_account.Credentials,
+        "from_service_account_info",
+        lambda info, scopes: "credentials",
+    )
+    monkeypatch.setattr(google_sheets, "AuthorizedSession", lambda credentials: ("authorized", credentials))
+
+    assert google_sheets._session() == ("authorized", "credentials")
+    monkeypatch.setenv("GOOGLE_SHEETS_EMULATOR", "1")
+    assert not isinstance(google_sheets._session(), tuple)
+
+
+def _export(params):
+    return handler_module.handler(
+        {
+            "rawPath": "/api/export",
+            "rawQueryString": params,
+            "requestContext": {"http": {"method": "GET"}},
+        },
+        None,
+    )
+
+
+def test_export_csv_uses_search_filters(monkeypatch):
+    monkeypatch.setattr(publications, "get_sheet_rows", fake_sheet_rows)
+
+    response = _export("format=csv&data_type_tags=Fish")
+    rows = list(csv.DictReader(io.StringIO(response["body"])))
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["Content-Type"].startswith("text/csv")
+    assert "iisd-ela-publications.csv" in response["headers"]["Content-Disposition"]
+    assert len(rows) == 1
+    assert rows[0]["authors"] == "Alpha, A.; Paterson, M. J."
+    assert (rows[0]["volume"], rows[0]["issue"]) == ("12", "3")
+
+
+def test_export_bibtex_and_ris_records(monkeypatch):
+    monkeypatch.setattr(publications, "get_sheet_rows", fake_sheet_rows)
+
+    bibtex = _export("format=bibtex")["body"]
+    ris = _export("format=ris&author_type=Students+%28theses%29")["body"]
+
+    assert "@article{Alpha2021," in bibtex
+    assert "  author = {Alpha, A. and Paterson, M. J.}," in bibtex
+    assert "  pages = {1--2}," in bibtex
+    assert "  doi = {10.0000/example}," in bibtex
+    assert "@mastersthesis{Student2020," in bibtex
+    assert ris.startswith("TY  - THES\r\nAU  - Student, S.\r\n")
+    assert "PB  - Lakehead University\r\n" in ris
+    assert ris.rstrip().endswith("ER  -")
+
+
+def test_export_rejects_unknown_format():
+    assert _export("format=xml")["statusCode"] == 400
+
+
+def test_client_index_encodes_sorted_rows_and_delta_postings(monkeypatch):
+    monkeypatch.setattr(publications, "get_sheet_rows", fake_sheet_rows)
+
+    index = publications.get_client_index()
+
+    assert index["format"] == 2
+    assert [row[2:4] for row in index["publications"]] == [["2021", 1], ["2020", 3]]
+    assert "reviewer-only" not in index["publications"][0][4]
+    assert index["case_folds"]["ß"] == "ss"
+    assert "fish response" in index["publications"][0][4]
+    assert index["postings"]["data_type_tags"] == {"Chemistry": [1], "Fish": [0]}
+    assert index["postings"]["author_tags"]["Paterson, M J"] == [0]
+    assert index["options"]["authors"] == ["Paterson, M. J.", "Student, S."]
+
+
+def test_preload_builds_indexes_before_workers_fork(monkeypatch):
+    payload = fake_sheet_rows()
+    monkeypatch.setattr(
+        publications,
+        "get_sheet_rows",
+        lambda cache_ttl_seconds=300, force_refresh=False: payload,
+    )
+
+    data = publications.preload_data()
+
+    assert {"author_index", "client_index"} <= set(data)
+    assert publications.get_client_index() is data["client_index"]
+
+
+def test_client_index_general_search_matches_api(monkeypatch):
+    rows = PUBLICATION_ROWS + [
+        {**PUBLICATION_ROWS[0], "title": "Straße runoff", "internal_notes": "embargoed"},
+        {**PUBLICATION_ROWS[0], "title": "STRASSE runoff"},
+    ]
+    monkeypatch.setattr(
+        publications,
+        "get_sheet_rows",
+        lambda cache_ttl_seconds=300, force_refresh=False: {"publications": rows, "authors": AUTHOR_ROWS},
+    )
+    index = publications.get_client_index()
+
+    for needle in ("ß", "straße", "Strasse", "RUNOFF", "fish"):
+        api_titles = [
+            result["citation_html"]
+            for result in publications.search_publications({"general_search": needle})["results"]
+        ]
+        # Mirrors foldSearchText in static/app.js.
+        folded = "".join(index["case_folds"].get(char, char.lower()) for char in needle)
+        client_titles = [row[0] for row in index["publications"] if folded in row[4]]
+        assert client_titles == api_titles, needle
+    assert len(api_titles) == 3
+    assert not any("embargoed" in row[4] for row in index["publications"])
+
+
+def test_client_index_endpoint_supports_conditional_requests(monkeypatch):
+    monkeypatch.setattr(publications, "get_sheet_rows", fake_sheet_rows)
+    event = {
+        "rawPath": "/api/index",
+        "rawQueryString": "",
+        "requestContext": {"http": {"method": "GET"}},
+    }
+
+    response = handler_module.handler(event, None)
+    etag = response["headers"]["ETag"]
+    revalidated = handler_module.handler({**event, "headers": {"If-None-Match": etag}}, None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["version"] == etag.strip('"')
+    assert response["headers"]["Cache-Control"] == "public, max-age=300"
+    assert (revalidated["statusCode"], revalidated["body"]) == (304, "")